@@ -0,0 +1,477 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import openpyxl
+
+from roll import (
+    DICE_BACKENDS,
+    EXCEL_ZONES,
+    CompletionIndex,
+    Config,
+    RollEngine,
+    SheetCache,
+    build_talent_cache,
+    compile_dice_expression,
+    config_talent_rows,
+    export_native_sheet,
+    iter_zone_rows,
+    iter_zone_rows_per_zone,
+    load_talent_cache,
+    load_workbooks,
+    make_dice,
+    read_talent_rows,
+)
+
+# Table des étapes Earthdawn utilisée pour générer des colonnes "Dés" réalistes
+STEP_DICE = [
+    "D4", "D6", "D8", "D10", "D12", "2D6", "D8+D6", "2D8", "D10+D8",
+    "2D10", "D12+D10", "2D12", "D12+2D6", "D12+D8+D6", "D12+2D8",
+    "D12+D10+D8", "D20+2D6", "D20+D8+D6", "D20+2D8", "D20+D10+D8",
+]
+HEADERS = ["Talents", "Rang", "Attr.", "Niv. Tot.", "Dés", "Classification"]
+# Échelles de la suite : (lignes par zone, None = zones d'origine ; feuilles ajoutées)
+SCALES = {
+    "personnage": (None, 0),
+    "gros": (400, 0),
+    "campagne": (400, 24),
+}
+REGRESSION_TOLERANCE = 0.2
+
+def generate_workbook(
+    path: str,
+    zones: Dict[str, List[Tuple[int, int]]] = EXCEL_ZONES,
+    extra_rows: int = 150,
+    seed: int = 0
+):
+    """Génère une fiche de personnage synthétique respectant la disposition des zones."""
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+
+    for sheet_name, sheet_zones in zones.items():
+        sheet = workbook.create_sheet(sheet_name)
+        last_row = max(end for _, end in sheet_zones) + extra_rows
+
+        # Remplissage hors zones, comme sur une vraie fiche (notes, calculs...)
+        for row in range(1, last_row + 1):
+            for col in range(18, 30):
+                sheet.cell(row, col, rng.choice(["note", rng.randint(0, 40)]))
+
+        for start, end in sheet_zones:
+            for col, header in enumerate(HEADERS, start=2):
+                sheet.cell(start, col, header)
+            for row in range(start + 1, end + 2):
+                step = rng.randint(3, len(STEP_DICE) + 2)
+                talent = f"Talent {sheet_name} {row}"
+                if rng.random() < 0.3:
+                    talent += " (D)"
+                values = [
+                    talent,
+                    rng.randint(1, 10),
+                    rng.randint(2, 9),
+                    step,
+                    STEP_DICE[step - 3],
+                    rng.choice([None, None, None, 1, 2, 3, 4]),
+                ]
+                for col, value in enumerate(values, start=2):
+                    sheet.cell(row, col, value)
+                for col in range(8, 18):
+                    sheet.cell(row, col, rng.randint(0, 20))
+
+    workbook.save(path)
+
+def time_call(func: Callable[[], object], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def report(name: str, timings: List[float]):
+    print(
+        f"{name:<28} min {min(timings) * 1000:8.1f} ms"
+        f"   median {statistics.median(timings) * 1000:8.1f} ms"
+    )
+
+def bench_load(args: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "fiche.xlsx")
+        generate_workbook(path, extra_rows=args.extra_rows)
+
+        config_data = Config.get_default_config()
+        single = time_call(lambda: list(iter_zone_rows(path, EXCEL_ZONES, config_data)), args.repeat)
+        per_zone = time_call(
+            lambda: list(iter_zone_rows_per_zone(path, EXCEL_ZONES, config_data)),
+            args.repeat
+        )
+
+    report("iter_zone_rows", single)
+    report("iter_zone_rows_per_zone", per_zone)
+    print(f"speedup x{statistics.median(per_zone) / statistics.median(single):.1f}")
+
+def measure_memory(func: Callable[[], object]) -> Tuple[int, int, int]:
+    # Pic mémoire, mémoire conservée par le résultat et nombre de blocs alloués pendant l'appel
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    try:
+        result = func()
+        blocks = sys.getallocatedblocks() - blocks
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, current, blocks
+
+def bench_ingest(args: argparse.Namespace):
+    zones = {
+        sheet_name: [(start, start + args.zone_rows) for start, _ in sheet_zones[:1]]
+        for sheet_name, sheet_zones in EXCEL_ZONES.items()
+    }
+    config_data = Config.get_default_config()
+    config_data['excel_zones'] = zones
+    config_talents = config_talent_rows(config_data)
+
+    def per_zone_path():
+        talent_rows: Dict[str, List[Any]] = {}
+        for sheet_name, rows in iter_zone_rows_per_zone(path, zones, config_data):
+            talent_rows.setdefault(sheet_name, []).append(rows or [])
+        return talent_rows, build_talent_cache(talent_rows, config_data, config_talents)
+
+    def rows_path():
+        talent_rows = read_talent_rows(path, config_data)
+        return talent_rows, build_talent_cache(talent_rows, config_data, config_talents)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "fiche.xlsx")
+        generate_workbook(path, zones, extra_rows=0)
+
+        results = {}
+        for name, func in (("read_excel par zone", per_zone_path), ("lignes en flux", rows_path)):
+            timings = time_call(func, args.repeat)
+            results[name] = (timings, *measure_memory(func))
+
+    print(f"{len(zones)} feuilles de {args.zone_rows} lignes")
+    for name, (timings, peak, current, blocks) in results.items():
+        report(name, timings)
+        print(
+            f"{'':<28} pic {peak / 2**20:6.1f} Mo   conservé {current / 2**20:6.1f} Mo"
+            f"   transitoire {(peak - current) / 2**20:6.1f} Mo   blocs {blocks:8d}"
+        )
+
+def bench_workbooks(args: argparse.Namespace):
+    config_data = Config.get_default_config()
+    config_talents = config_talent_rows(config_data)
+    workers = [int(count) for count in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for seed in range(args.count):
+            path = os.path.join(tmp_dir, f"fiche_{seed}.xlsx")
+            generate_workbook(path, extra_rows=args.extra_rows, seed=seed)
+            paths.append(path)
+
+        # Sans cache disque : chaque mesure relit toutes les fiches
+        sequential = time_call(
+            lambda: [load_talent_cache(path, config_data, config_talents) for path in paths],
+            args.repeat
+        )
+        pooled = {
+            count: time_call(
+                lambda: load_workbooks(paths, config_data, config_talents, max_workers=count),
+                args.repeat
+            )
+            for count in workers
+        }
+
+    print(f"{args.count} fiches, {os.cpu_count()} coeurs")
+    report("séquentiel", sequential)
+    for count, timings in pooled.items():
+        report(f"ProcessPool x{count}", timings)
+        print(f"{'':<28} speedup x{statistics.median(sequential) / statistics.median(timings):.1f}")
+
+def bench_roll(args: argparse.Namespace):
+    expression = compile_dice_expression(args.des)
+    rng = np.random.default_rng(0)
+
+    # La boucle par dé est mesurée sur un échantillon puis extrapolée
+    sample = min(args.n, 100_000)
+    loop = time_call(
+        lambda: [expression.roll(args.karma) for _ in range(sample)],
+        args.repeat
+    )
+    loop = [timing * args.n / sample for timing in loop]
+    batch = time_call(lambda: expression.roll_many(args.n, args.karma, rng), args.repeat)
+
+    print(f"{args.n} lancers de {args.des}")
+    report("DiceExpression.roll (boucle)", loop)
+    report("DiceExpression.roll_many", batch)
+    print(f"speedup x{statistics.median(loop) / statistics.median(batch):.1f}")
+
+def scale_zones(zone_rows: Optional[int], extra_sheets: int) -> Dict[str, List[Tuple[int, int]]]:
+    zones = {
+        sheet_name: sheet_zones if zone_rows is None else [(sheet_zones[0][0], sheet_zones[0][0] + zone_rows)]
+        for sheet_name, sheet_zones in EXCEL_ZONES.items()
+    }
+    for index in range(extra_sheets):
+        zones[f"Extra{index + 1}"] = zones["D1"]
+    return zones
+
+def per_call(func: Callable[[int], object], calls: int, repeat: int) -> float:
+    # Médiane du temps par appel, sur `calls` appels par mesure
+    timings = time_call(lambda: [func(index) for index in range(calls)], repeat)
+    return statistics.median(timings) / calls
+
+def typo(name: str, rng: random.Random) -> str:
+    # Requête approchée : une lettre remplacée et la fin du nom coupée
+    position = rng.randrange(len(name))
+    query = name[:position] + rng.choice("aeiou") + name[position + 1:]
+    return query[:max(4, len(query) * 2 // 3)]
+
+def bench_scale(zones: Dict[str, List[Tuple[int, int]]], tmp_dir: str, args: argparse.Namespace) -> Dict[str, float]:
+    config = Config(os.path.join(tmp_dir, "config.json"))
+    config.data['excel_zones'] = zones
+    config.data['rng_seed'] = 0
+    config_data = dict(config.data)
+    config_talents = config.config_talents
+    path = os.path.join(tmp_dir, "fiche.xlsx")
+    generate_workbook(path, zones, extra_rows=args.extra_rows)
+
+    cache_path = os.path.join(tmp_dir, "cache.json")
+
+    def cold_load():
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        return RollEngine.read_file(path, config_data, config_talents, SheetCache(cache_path))
+
+    results = {'load_cold_s': statistics.median(time_call(cold_load, args.repeat))}
+    RollEngine.read_file(path, config_data, config_talents, SheetCache(cache_path))
+    results['load_cached_s'] = statistics.median(time_call(
+        lambda: RollEngine.read_file(path, config_data, config_talents, SheetCache(cache_path)),
+        args.repeat
+    ))
+
+    native_path = export_native_sheet(
+        path, load_talent_cache(path, config_data, config_talents), config_data
+    )
+    results['load_native_s'] = statistics.median(time_call(
+        lambda: RollEngine.read_file(native_path, config_data, config_talents, SheetCache(cache_path)),
+        args.repeat
+    ))
+
+    talent_rows = read_talent_rows(path, config_data)
+    results['ingest_s'] = statistics.median(time_call(
+        lambda: build_talent_cache(talent_rows, config_data, config_talents),
+        args.repeat
+    ))
+
+    engine = RollEngine(config, sheet_cache=SheetCache(cache_path))
+    engine.load_file(path)
+    talents = engine.talent_cache.get_all_talents()
+    results['talents'] = len(talents)
+
+    results['roll_s'] = per_call(
+        lambda index: engine.roll(talents[index % len(talents)], "D6"),
+        args.calls, args.repeat
+    )
+    expression = engine.talent_cache.get_talent(talents[0]).expression
+    rng = np.random.default_rng(0)
+    results['roll_batch_100k_s'] = statistics.median(time_call(
+        lambda: expression.roll_many(100_000, 6, rng),
+        args.repeat
+    ))
+
+    rng_queries = random.Random(0)
+    index = CompletionIndex(talents)
+    prefixes = [talent[:3] for talent in rng_queries.sample(talents, min(len(talents), 200))]
+    results['autocomplete_prefix_s'] = per_call(
+        lambda i: index.prefix(prefixes[i % len(prefixes)]),
+        args.calls, args.repeat
+    )
+    typos = [typo(talent, rng_queries) for talent in rng_queries.sample(talents, min(len(talents), 200))]
+    results['autocomplete_fuzzy_s'] = per_call(
+        lambda i: engine.search(typos[i % len(typos)]),
+        max(args.calls // 10, 1), args.repeat
+    )
+
+    # Historique déjà plein : chaque ajout évince le plus ancien
+    for talent in talents[:engine.roll_history.maxlen]:
+        engine.add_to_history(talent, 10, "10 (D10)")
+    results['history_full_add_s'] = per_call(
+        lambda i: engine.add_to_history(talents[i % len(talents)], 10, "10 (D10)"),
+        args.calls, args.repeat
+    )
+    return results
+
+def compare_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for scale, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline['results'].get(scale, {}).get(metric)
+            if not metric.endswith('_s') or not reference:
+                continue
+            ratio = value / reference
+            flag = "RÉGRESSION" if ratio > 1 + tolerance else ("mieux" if ratio < 1 - tolerance else "")
+            print(f"  {scale:<11} {metric:<24} {reference * 1000:10.3f} -> {value * 1000:10.3f} ms  x{ratio:5.2f} {flag}")
+            if flag == "RÉGRESSION":
+                regressions.append(f"{scale}/{metric}")
+    return regressions
+
+def bench_suite(args: argparse.Namespace):
+    scales = args.scales.split(",")
+    results: Dict[str, Dict[str, float]] = {}
+    for scale in scales:
+        # Messages du chargement sur stderr : stdout reste lisible
+        with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(sys.stderr):
+            results[scale] = bench_scale(scale_zones(*SCALES[scale]), tmp_dir, args)
+        print(f"{scale} ({results[scale]['talents']} talents)")
+        for metric, value in results[scale].items():
+            if metric.endswith('_s'):
+                print(f"  {metric:<24} {value * 1000:10.3f} ms")
+
+    report_data = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'openpyxl': openpyxl.__version__,
+        },
+        'settings': {'repeat': args.repeat, 'calls': args.calls, 'extra_rows': args.extra_rows},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report_data, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Comparaison avec {args.baseline} (tolérance {args.tolerance:.0%})")
+        regressions = compare_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} régression(s) : {', '.join(regressions)}")
+            sys.exit(1)
+
+def bench_rng(args: argparse.Namespace):
+    expression = compile_dice_expression(args.des)
+    faces = [int(face) for face in args.faces.split(",")]
+
+    print(f"{args.n} dés ({args.faces} faces), {args.n} lancers de {args.des}")
+    for backend in sorted(DICE_BACKENDS):
+        dice = make_dice(backend, 0)
+        die = dice.die
+        draws = time_call(
+            lambda: [die(face) for face in faces for _ in range(args.n // len(faces))],
+            args.repeat
+        )
+        rolls = time_call(lambda: [expression.roll(args.karma, dice) for _ in range(args.n)], args.repeat)
+        print(
+            f"{backend:<10} dés {args.n / statistics.median(draws) / 1e6:6.2f} M/s"
+            f"   lancers {args.n / statistics.median(rolls) / 1e3:8.1f} k/s"
+        )
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    # Lignes "import time: self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        if not total.strip().isdigit() or name.startswith("  "):
+            continue  # en-tête ou sous-module
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+def bench_startup(args: argparse.Namespace):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "roll.py")
+    command = [args.exe] if args.exe else [sys.executable, "-X", "importtime", script]
+    command.append("--startup-benchmark")
+
+    wall, in_process = [], []
+    imports: Dict[str, List[int]] = {}
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(command, capture_output=True, text=True, check=True)
+        wall.append(time.perf_counter() - start)
+        in_process.append(json.loads(completed.stdout.splitlines()[-1])["first_mainloop_s"])
+        for name, total in parse_importtime(completed.stderr).items():
+            imports.setdefault(name, []).append(total)
+
+    report("lancement -> mainloop", wall)
+    report("import roll -> mainloop", in_process)
+    if imports:
+        print("Imports les plus coûteux (cumulé, médiane) :")
+        slowest = sorted(imports.items(), key=lambda item: -statistics.median(item[1]))
+        for name, totals in slowest[:args.top]:
+            print(f"  {name:<30} {statistics.median(totals) / 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du lanceur de dés")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    load_parser = subparsers.add_parser("load", help="Lecture des zones d'une fiche Excel")
+    load_parser.add_argument("--repeat", type=int, default=5)
+    load_parser.add_argument("--extra-rows", type=int, default=150)
+    load_parser.set_defaults(func=bench_load)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Ingestion read_excel par zone contre lecture en flux")
+    ingest_parser.add_argument("--zone-rows", type=int, default=2000)
+    ingest_parser.add_argument("--repeat", type=int, default=3)
+    ingest_parser.set_defaults(func=bench_ingest)
+
+    workbooks_parser = subparsers.add_parser("workbooks", help="Chargement d'un dossier de fiches en parallèle")
+    workbooks_parser.add_argument("--count", type=int, default=12)
+    workbooks_parser.add_argument("--workers", default="1,2,4", help="tailles de pool, séparées par des virgules")
+    workbooks_parser.add_argument("--extra-rows", type=int, default=150)
+    workbooks_parser.add_argument("--repeat", type=int, default=3)
+    workbooks_parser.set_defaults(func=bench_workbooks)
+
+    roll_parser = subparsers.add_parser("roll", help="Lancers unitaires contre lancers groupés")
+    roll_parser.add_argument("--des", default="D20+D8+D6")
+    roll_parser.add_argument("--n", type=int, default=1_000_000)
+    roll_parser.add_argument("--karma", type=int, default=None, help="Faces du dé de karma")
+    roll_parser.add_argument("--repeat", type=int, default=3)
+    roll_parser.set_defaults(func=bench_roll)
+
+    suite_parser = subparsers.add_parser("suite", help="Suite complète sur plusieurs tailles de fiche, avec référence JSON")
+    suite_parser.add_argument("--scales", default=",".join(SCALES), help="parmi " + ", ".join(SCALES))
+    suite_parser.add_argument("--repeat", type=int, default=3)
+    suite_parser.add_argument("--calls", type=int, default=2000, help="appels par mesure pour les opérations courtes")
+    suite_parser.add_argument("--extra-rows", type=int, default=150)
+    suite_parser.add_argument("--output", help="écrit les résultats dans ce fichier JSON")
+    suite_parser.add_argument("--baseline", help="compare à un fichier JSON de référence ; code de sortie 1 en cas de régression")
+    suite_parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    suite_parser.set_defaults(func=bench_suite)
+
+    rng_parser = subparsers.add_parser("rng", help="Dés par seconde pour chaque générateur")
+    rng_parser.add_argument("--des", default="D20+D8+D6")
+    rng_parser.add_argument("--faces", default="4,6,8,10,12,20")
+    rng_parser.add_argument("--n", type=int, default=300_000)
+    rng_parser.add_argument("--karma", type=int, default=6, help="Faces du dé de karma")
+    rng_parser.add_argument("--repeat", type=int, default=3)
+    rng_parser.set_defaults(func=bench_rng)
+
+    startup_parser = subparsers.add_parser("startup", help="Temps de démarrage de l'interface")
+    startup_parser.add_argument("--repeat", type=int, default=5)
+    startup_parser.add_argument("--top", type=int, default=10)
+    startup_parser.add_argument("--exe", help="Mesurer un exécutable (roll.exe) plutôt que roll.py")
+    startup_parser.set_defaults(func=bench_startup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
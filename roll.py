@@ -1,11 +1,68 @@
+from __future__ import annotations
+
+import time
+
+START_TIME = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk
 from tkinter import filedialog, messagebox
-import pandas as pd
+import argparse
+import atexit
+import asyncio
+import bisect
+import contextlib
+import csv
+import hashlib
+import math
+import os
 import re
 import random
+import secrets
+import struct
+import sys
 import json
-from typing import Dict, List, Tuple, Optional, Any
+import logging
+import multiprocessing
+import queue
+import threading
+import tracemalloc
+import unicodedata
+import zipfile
+import xml.etree.ElementTree as ElementTree
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple, Optional, Any, Iterator, NamedTuple, Sequence
+
+class LazyModule:
+    """Module importé au premier accès à l'un de ses attributs."""
+
+    def __init__(self, loader: Callable[[], Any]):
+        self._loader = loader
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = self._loader()
+        return self._module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+# numpy (recherche et calculs) et pandas (fiches .xls) sont importés à la demande
+# pour accélérer le démarrage.
+# Les imports explicites restent visibles pour l'analyse de PyInstaller.
+def _import_numpy():
+    import numpy
+    return numpy
+
+def _import_pandas():
+    import pandas
+    return pandas
+
+np = LazyModule(_import_numpy)
+pd = LazyModule(_import_pandas)
 
 # Constants
 EXCEL_ZONES = {
@@ -21,8 +78,142 @@ SUBSTITUTE_TALENT_COLUMN_NAME = ['Connaissances', 'Compétences', 'Art / artisan
 REQUIRED_COLUMNS = ['Talents', 'Niv. Tot.', 'Dés', 'Classification']
 DEFAULT_KARMA_DIE = 'D12'
 MAX_HISTORY_SIZE = 50
+QUICK_BUTTON_COLUMNS = 4  # colonnes de classification 1 à 4
+QUICK_BUTTON_ROWS = 5
+HISTORY_ROW_HEIGHT = 20
 WINDOW_SIZE = '600x800'
 UI_THEME = 'default'
+PROBABILITY_EPSILON = 1e-9
+EXCEL_USECOLS = "B:Q"
+EXCEL_LAST_COL = 17  # Q
+OPENPYXL_EXTENSIONS = ('.xlsx', '.xlsm', '.xltx', '.xltm')
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+EXCEL_ERROR_CODES = frozenset(('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'))
+# Cellules lues comme NaN par pandas (na_values par défaut), en plus des codes d'erreur Excel
+MISSING_CELL_STRINGS = EXCEL_ERROR_CODES | frozenset((
+    '', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+))
+WARMUP_DELAY_MS = 200
+LOAD_POLL_MS = 50
+SHEET_CACHE_FILENAME = 'dice_roller_cache.json'
+SHEET_CACHE_VERSION = 3  # 3 : dates exclues du Niv. Tot.
+ROLL_LOG_FILENAME = 'dice_roller_log'
+ROLL_LOG_FLUSH_S = 1.0
+# Enregistrement du journal : heure, talent, total, position et nombre des dés, explosions, karma
+ROLL_RECORD = struct.Struct('<dIiQHHB')
+DIE_RECORD = struct.Struct('<II')  # faces | KARMA_DIE_FLAG, valeur
+KARMA_DIE_FLAG = 0x80000000
+LOG_TALENT_ESCAPE_PATTERN = re.compile(r'\\([\\nr])')
+MAX_CACHED_SHEETS = 40  # un groupe entier ou un bestiaire
+# Format natif des fiches : en-tête, métadonnées JSON, chaînes, puis un enregistrement fixe par talent
+NATIVE_SHEET_EXTENSION = '.edsheet'
+NATIVE_SHEET_MAGIC = b'EDSHEET\0'
+NATIVE_SHEET_VERSION = 1
+NATIVE_SHEET_HEADER = struct.Struct('<8sHII')  # magique, version, octets de métadonnées, octets de chaînes
+NATIVE_TALENT_RECORD = struct.Struct('<ddB')  # Niv. Tot., classification (NaN : aucune), karma
+WATCH_INTERVAL_MS = 2000
+LOG_LEVEL = 'WARNING'
+RNG_BACKEND = 'buffered'
+RNG_BLOCK_SIZE = 4096  # tirages pré-calculés par type de dé
+SIMULATION_ROLLS = 100_000
+SIMULATION_TARGETS = (5, 20)
+SIMULATION_SHARDS_PER_WORKER = 4
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+XLSX_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+XLSX_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+XLSX_PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+# Formats de nombre intégrés qui affichent une date ou une heure (comme openpyxl)
+XLSX_DATE_FORMAT_IDS = frozenset(range(14, 23)) | frozenset((45, 46, 47))
+# Texte entre guillemets, caractères échappés, espacements et [couleurs] : ignorés avant de chercher d/m/y/h/s
+XLSX_FORMAT_LITERAL_PATTERN = re.compile(r'"[^"]*"|\\.|_.|\[(?!(?:hh?|mm?|ss?)\])[^\]]*\]')
+XLSX_DATE_FORMAT_PATTERN = re.compile(r'[dmhysDMHYS]')
+# Au plus 999 dés par groupe, 999 999 999 faces et un modificateur de 9 chiffres : les valeurs
+# d'un lancer ordinaire tiennent dans ROLL_RECORD et DIE_RECORD (RollLog écarte les autres)
+DICE_PATTERN = r'^((?:[1-9]\d{0,2})?D[1-9]\d{0,8}(?!\d)\s*[\+\-]?\s*)*\d{0,9}$'
+DICE_REGEX = re.compile(DICE_PATTERN)
+KARMA_SUFFIX = ' (D)'
+KARMA_DIE_PATTERN = re.compile(r'D[1-9]\d{0,8}')
+FUZZY_RESULT_LIMIT = 15
+FUZZY_MIN_SCORE = 0.3
+CLASSIFICATION_WEIGHT = 0.1
+RECENCY_WEIGHT = 0.3
+WORD_MATCH_WEIGHT = 0.5
+DICE_GROUP_PATTERN = re.compile(r"(\d*)D(\d+)")
+DICE_MODIFIER_PATTERN = re.compile(r'([\+\-])\s*(\d+)$')
+PERF_BUCKETS_PER_OCTAVE = 8  # seaux de ~9 % : précision des percentiles
+PERF_PERCENTILES = (50, 95, 99)
+
+# Diagnostics : rien n'est formaté tant que le niveau n'est pas activé
+logger = logging.getLogger('salem_ed_roll')
+
+class PerfStats:
+    """Histogrammes des durées par étape, en mémoire et à seaux logarithmiques (coût constant par mesure)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[int, int]] = {}
+        self._totals: Dict[str, float] = {}
+        self._maximums: Dict[str, float] = {}
+
+    def record(self, stage: str, seconds: float):
+        bucket = math.floor(math.log2(max(seconds, 1e-9)) * PERF_BUCKETS_PER_OCTAVE)
+        with self._lock:
+            histogram = self._histograms.setdefault(stage, {})
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+            self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+            if seconds > self._maximums.get(stage, 0.0):
+                self._maximums[stage] = seconds
+
+    @contextlib.contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._totals.clear()
+            self._maximums.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Percentiles en ms par étape (borne haute du seau), et pic tracemalloc s'il est actif."""
+        with self._lock:
+            histograms = {stage: sorted(histogram.items()) for stage, histogram in self._histograms.items()}
+            totals = dict(self._totals)
+            maximums = dict(self._maximums)
+
+        stages = {}
+        for stage, buckets in sorted(histograms.items()):
+            count = sum(bucket_count for _, bucket_count in buckets)
+            stats = {'count': count, 'total_ms': totals[stage] * 1000}
+            for percentile in PERF_PERCENTILES:
+                rank = math.ceil(count * percentile / 100)
+                seen = 0
+                for bucket, bucket_count in buckets:
+                    seen += bucket_count
+                    if seen >= rank:
+                        break
+                upper = 2 ** ((bucket + 1) / PERF_BUCKETS_PER_OCTAVE)
+                stats[f'p{percentile}_ms'] = min(upper, maximums[stage]) * 1000
+            stats['max_ms'] = maximums[stage] * 1000
+            stages[stage] = stats
+
+        snapshot: Dict[str, Any] = {'stages': stages}
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot['memory'] = {'current_bytes': current, 'peak_bytes': peak}
+        return snapshot
+
+    def dump(self, file_path: str):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=4, ensure_ascii=False)
+
+perf = PerfStats()
 
 class ToolTip:
     def __init__(self, widget: tk.Widget, text: str):
@@ -51,32 +242,235 @@ class ToolTip:
             self.tooltip.destroy()
             self.tooltip = None
 
+def fold_text(text: str) -> str:
+    # Minuscules sans accents : "Compétences" -> "competences"
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+class CompletionIndex:
+    """Recherche par préfixe (O(log n + k)) insensible aux accents, sur le nom entier ou par mot."""
+
+    def __init__(self, names: Optional[List[str]] = None):
+        self._keys: List[str] = []  # noms normalisés, triés
+        self._names: List[str] = []  # noms d'origine, même ordre
+        self._token_keys: List[str] = []  # mots normalisés, triés
+        self._token_names: List[str] = []
+        if names:
+            self.rebuild(names)
+
+    def rebuild(self, names: List[str]):
+        entries = sorted((fold_text(name), name) for name in set(names))
+        self._keys = [key for key, _ in entries]
+        self._names = [name for _, name in entries]
+        tokens = sorted(
+            (token, name)
+            for key, name in entries
+            for token in set(TOKEN_PATTERN.findall(key))
+        )
+        self._token_keys = [token for token, _ in tokens]
+        self._token_names = [name for _, name in tokens]
+
+    def add(self, name: str):
+        key = fold_text(name)
+        index = bisect.bisect_left(self._keys, key)
+        while index < len(self._keys) and self._keys[index] == key:
+            if self._names[index] == name:
+                return
+            index += 1
+        self._keys.insert(index, key)
+        self._names.insert(index, name)
+        for token in set(TOKEN_PATTERN.findall(key)):
+            index = bisect.bisect_left(self._token_keys, token)
+            self._token_keys.insert(index, token)
+            self._token_names.insert(index, name)
+
+    def remove(self, name: str):
+        key = fold_text(name)
+        self._remove(self._keys, self._names, key, name)
+        for token in set(TOKEN_PATTERN.findall(key)):
+            self._remove(self._token_keys, self._token_names, token, name)
+
+    @staticmethod
+    def _remove(keys: List[str], names: List[str], key: str, name: str):
+        index = bisect.bisect_left(keys, key)
+        while index < len(keys) and keys[index] == key:
+            if names[index] == name:
+                del keys[index]
+                del names[index]
+                return
+            index += 1
+
+    @property
+    def names(self) -> List[str]:
+        return self._names
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        return (
+            bisect.bisect_left(keys, prefix),
+            bisect.bisect_right(keys, prefix + '\U0010ffff')
+        )
+
+    def prefix(self, text: str) -> List[str]:
+        start, end = self._prefix_range(self._keys, fold_text(text))
+        return self._names[start:end]
+
+    def words(self, text: str) -> List[str]:
+        # Chaque mot saisi doit commencer un mot du nom : "arm ast" -> "Armure astrale"
+        query_tokens = TOKEN_PATTERN.findall(fold_text(text))
+        if not query_tokens:
+            return []
+
+        matches = None
+        for token in query_tokens:
+            start, end = self._prefix_range(self._token_keys, token)
+            found = set(self._token_names[start:end])
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return [name for name in self._names if name in matches]
+
+def trigrams(key: str) -> set:
+    grams = set()
+    for word in TOKEN_PATTERN.findall(key):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class TalentSearchIndex:
+    """Recherche approchée et classée sur un index de trigrammes, construit une fois par TalentCache."""
+
+    def __init__(self, talents: Dict[str, Talent]):
+        # Les variantes "X" et "X (D)" forment un seul groupe
+        groups: Dict[str, List[str]] = {}
+        for talent in talents:
+            base = talent[:-len(KARMA_SUFFIX)] if talent.endswith(KARMA_SUFFIX) else talent
+            groups.setdefault(base, []).append(talent)
+
+        self._group_names: List[List[str]] = []
+        self._group_words: List[List[str]] = []
+        self._group_of: Dict[str, int] = {}
+        gram_counts = []
+        classification_bonus = []
+        postings: Dict[str, List[int]] = {}
+
+        for group_id, (base, names) in enumerate(sorted(groups.items())):
+            names.sort(key=lambda name: not name.endswith(KARMA_SUFFIX))
+            key = fold_text(base)
+            grams = trigrams(key)
+            for gram in grams:
+                postings.setdefault(gram, []).append(group_id)
+            for name in names:
+                self._group_of[name] = group_id
+
+            self._group_names.append(names)
+            self._group_words.append(TOKEN_PATTERN.findall(key))
+            gram_counts.append(len(grams))
+            classified = any(is_classified(talents[name].classification) for name in names)
+            classification_bonus.append(CLASSIFICATION_WEIGHT if classified else 0.0)
+
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._gram_counts = np.array(gram_counts, dtype=np.float64)
+        self._classification_bonus = np.array(classification_bonus, dtype=np.float64)
+
+    def search(
+        self,
+        text: str,
+        last_rolled: Optional[Dict[str, int]] = None,
+        roll_count: int = 0,
+        limit: int = FUZZY_RESULT_LIMIT
+    ) -> List[str]:
+        """last_rolled : talent -> numéro de son dernier lancer, roll_count : nombre de lancers."""
+        key = fold_text(text)
+        query = [gram for gram in trigrams(key) if gram in self._postings]
+        if not query or not self._group_names:
+            return []
+
+        # Coefficient de Dice sur les trigrammes partagés
+        shared = np.bincount(
+            np.concatenate([self._postings[gram] for gram in query]),
+            minlength=len(self._group_names)
+        )
+        similarity = 2 * shared / (len(trigrams(key)) + self._gram_counts)
+        candidates = np.nonzero(similarity >= FUZZY_MIN_SCORE)[0]
+        if not len(candidates):
+            return []
+
+        scores = similarity[candidates] + self._classification_bonus[candidates]
+        if last_rolled:
+            recency = np.zeros(len(self._group_names))
+            for talent, roll_number in last_rolled.items():
+                group_id = self._group_of.get(talent)
+                if group_id is not None:
+                    bonus = RECENCY_WEIGHT * 0.9 ** (roll_count - roll_number)
+                    recency[group_id] = max(recency[group_id], bonus)
+            scores += recency[candidates]
+
+        # Les meilleurs candidats sont départagés par la correspondance mot à mot
+        shortlist = candidates[np.argsort(-scores, kind='stable')[:limit * 4]]
+        query_tokens = TOKEN_PATTERN.findall(key)
+        ranked = sorted(
+            shortlist.tolist(),
+            key=lambda group_id: -(
+                float(scores[np.searchsorted(candidates, group_id)])
+                + (WORD_MATCH_WEIGHT if all(
+                    any(word.startswith(token) for word in self._group_words[group_id])
+                    for token in query_tokens
+                ) else 0.0)
+            )
+        )
+        return [name for group_id in ranked[:limit] for name in self._group_names[group_id]]
+
 class AutocompleteCombobox(ttk.Combobox):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._completion_list = []
+        self._index = CompletionIndex()
         self._hits = []
         self._hit_index = 0
+        self._filtered = False
         self.position = 0
+        # Recherche approchée classée, utilisée quand aucun nom ne commence par la saisie
+        self.fuzzy_search: Optional[Callable[[str], List[str]]] = None
         self.bind('<KeyRelease>', self.handle_keyrelease)
 
     def set_completion_list(self, completion_list: List[str]):
-        self._completion_list = sorted(completion_list, key=str.lower)
+        self._index.rebuild(completion_list)
         self._hits = []
         self._hit_index = 0
         self.position = 0
-        self['values'] = self._completion_list
+        self.show_values(None)
+
+    def update_completions(self, added: List[str], removed: List[str]):
+        if not added and not removed:
+            return
+        for element in removed:
+            self._index.remove(element)
+        for element in added:
+            self._index.add(element)
+        self.show_values(None)
+
+    def show_values(self, values: Optional[List[str]]):
+        # None : liste complète dans la liste déroulante
+        if values is None:
+            self['values'] = self._index.names
+            self._filtered = False
+        else:
+            self['values'] = values
+            self._filtered = True
 
     def autocomplete(self, delta: int = 0):
+        with perf.timer('autocomplete'):
+            self._autocomplete(delta)
+
+    def _autocomplete(self, delta: int):
         if delta:
             self.delete(self.position, tk.END)
         else:
             self.position = len(self.get())
 
-        _hits = []
-        for element in self._completion_list:
-            if element.lower().startswith(self.get().lower()):
-                _hits.append(element)
+        _hits = self._index.prefix(self.get())
 
         if _hits != self._hits:
             self._hit_index = 0
@@ -86,9 +480,21 @@ class AutocompleteCombobox(ttk.Combobox):
             self._hit_index = (self._hit_index + delta) % len(self._hits)
 
         if self._hits:
+            if self._filtered:
+                self.show_values(None)
             self.delete(0, tk.END)
             self.insert(0, self._hits[self._hit_index])
             self.select_range(self.position, tk.END)
+        else:
+            # Pas de nom commençant ainsi : recherche approchée dans la liste déroulante
+            if self.fuzzy_search is not None:
+                word_hits = self.fuzzy_search(self.get())
+            else:
+                word_hits = self._index.words(self.get())
+            if word_hits:
+                self.show_values(word_hits)
+            elif self._filtered:
+                self.show_values(None)
 
     def handle_keyrelease(self, event):
         if event.keysym == "BackSpace":
@@ -102,37 +508,366 @@ class AutocompleteCombobox(ttk.Combobox):
                 self.delete(self.position, tk.END)
         elif event.keysym == "Right":
             self.position = self.index(tk.END)
-        elif len(event.keysym) == 1:
+        elif len(event.keysym) == 1 or (event.char and event.char.isprintable()):
+            # event.char couvre les lettres accentuées et l'espace
             self.autocomplete()
 
+class RandomDice:
+    """Dés tirés avec le module random ; une graine rend les lancers rejouables."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+
+    def die(self, faces: int) -> int:
+        return self._random.randint(1, faces)
+
+class BufferedDice:
+    """Dés servis depuis des blocs tirés d'avance par numpy (PCG64), un bloc par nombre de faces."""
+
+    def __init__(self, seed: Optional[int] = None, block_size: int = RNG_BLOCK_SIZE):
+        self.seed = seed
+        self.block_size = block_size
+        self._generator: Optional[np.random.Generator] = None  # numpy n'est chargé qu'au premier lancer
+        self._buffers: Dict[int, List[int]] = {}
+
+    def die(self, faces: int) -> int:
+        buffer = self._buffers.get(faces)
+        if not buffer:
+            buffer = self._refill(faces)
+        return buffer.pop()
+
+    def _refill(self, faces: int) -> List[int]:
+        if self._generator is None:
+            self._generator = np.random.default_rng(self.seed)
+        buffer = self._generator.integers(1, faces + 1, size=self.block_size).tolist()
+        self._buffers[faces] = buffer
+        return buffer
+
+class SecretDice:
+    """Dés tirés avec secrets (générateur du système) : sans graine, pour les joueurs méfiants."""
+
+    def __init__(self, seed: Optional[int] = None):
+        pass
+
+    def die(self, faces: int) -> int:
+        return secrets.randbelow(faces) + 1
+
+DICE_BACKENDS = {
+    'random': RandomDice,
+    'buffered': BufferedDice,
+    'secrets': SecretDice,
+}
+
+def stream_seed(seed: Optional[int], stream: str) -> Optional[int]:
+    # Graine propre à un flux (un personnage) : indépendante des autres personnages chargés
+    if seed is None or not stream:
+        return seed
+    digest = hashlib.sha256(f"{seed}\0{stream}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+def make_dice(backend: str = RNG_BACKEND, seed: Optional[int] = None, stream: str = ''):
+    if backend not in DICE_BACKENDS:
+        logger.warning("Générateur inconnu : %s (%s), %s utilisé", backend, ', '.join(DICE_BACKENDS), RNG_BACKEND)
+        backend = RNG_BACKEND
+    return DICE_BACKENDS[backend](stream_seed(seed, stream))
+
+default_dice = BufferedDice()
+
+def roll_exploding_die(faces: int, dice=None) -> List[int]:
+    die = (dice or default_dice).die
+    rolls = [die(faces)]
+    while rolls[-1] == faces and faces > 1:  # Explosion (un D1 n'explose pas)
+        rolls.append(die(faces))
+    return rolls
+
+def roll_exploding_totals(
+    faces: int,
+    count: int,
+    n: int,
+    rng: np.random.Generator,
+    explosions: Optional[np.ndarray] = None
+) -> np.ndarray:
+    # Somme de `count` dés explosifs pour chacun des n lancers ;
+    # `explosions` reçoit, si fourni, le nombre d'explosions de chaque lancer
+    rolls = rng.integers(1, faces + 1, size=(n, count))
+    totals = rolls.sum(axis=1)
+    if faces > 1:
+        # Seuls les dés au maximum sont relancés, jusqu'à épuisement
+        exploding = np.nonzero(rolls == faces)[0]
+        while exploding.size:
+            if explosions is not None:
+                explosions += np.bincount(exploding, minlength=n)
+            rerolls = rng.integers(1, faces + 1, size=exploding.size)
+            totals += np.bincount(exploding, weights=rerolls, minlength=n).astype(totals.dtype)
+            exploding = exploding[rerolls == faces]
+    return totals
+
+class RollResult(NamedTuple):
+    total: int
+    details: str
+    dice: Tuple[Tuple[int, int, bool], ...]  # (faces, valeur, karma) pour chaque dé, explosions comprises
+
+class DiceExpression(NamedTuple):
+    groups: Tuple[Tuple[int, int], ...]  # (nombre, faces)
+    modifier: int
+    dice: Tuple[Tuple[int, str], ...]  # (faces, libellé) pour chaque dé
+
+    def roll(self, karma_faces: Optional[int] = None, dice=None) -> Tuple[int, str]:
+        result = self.roll_detailed(karma_faces, dice)
+        return result.total, result.details
+
+    def roll_detailed(self, karma_faces: Optional[int] = None, dice=None) -> RollResult:
+        total = self.modifier
+        details = []
+        rolled = []
+
+        for faces, label in self.dice:
+            rolls = roll_exploding_die(faces, dice)
+            total += sum(rolls)
+            details.append(f"{rolls[0]}{label}")
+            details.extend(f"EXP {roll}{label}" for roll in rolls[1:])
+            rolled.extend((faces, roll, False) for roll in rolls)
+
+        if self.modifier:
+            details.append(str(self.modifier))
+
+        if karma_faces:
+            rolls = roll_exploding_die(karma_faces, dice)
+            total += sum(rolls)
+            details.append(f"+karma: {rolls[0]} (D{karma_faces})")
+            details.extend(f"+karma: EXP {roll} (D{karma_faces})" for roll in rolls[1:])
+            rolled.extend((karma_faces, roll, True) for roll in rolls)
+
+        return RollResult(total, " + ".join(details), tuple(rolled))
+
+    def roll_many(
+        self,
+        n: int,
+        karma_faces: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None,
+        explosions: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        rng = rng if rng is not None else np.random.default_rng()
+        totals = np.full(n, self.modifier, dtype=np.int64)
+        for count, faces in self.groups:
+            if count:
+                totals += roll_exploding_totals(faces, count, n, rng, explosions)
+        if karma_faces:
+            totals += roll_exploding_totals(karma_faces, 1, n, rng, explosions)
+        return totals
+
+class Distribution(NamedTuple):
+    offset: int  # valeur correspondant à probs[0]
+    probs: np.ndarray
+    at_least: np.ndarray  # at_least[i] = P(résultat >= offset + i)
+
+    def prob_at_least(self, target: int) -> float:
+        index = target - self.offset
+        if index <= 0:
+            return float(self.at_least[0]) if len(self.at_least) else 0.0
+        if index >= len(self.at_least):
+            return 0.0
+        return float(self.at_least[index])
+
+    def mean(self) -> float:
+        return float(np.dot(np.arange(self.offset, self.offset + len(self.probs)), self.probs))
+
+@lru_cache(maxsize=64)
+def exploding_die_pmf(faces: int, epsilon: float = PROBABILITY_EPSILON) -> np.ndarray:
+    # probs[i] = P(dé explosif = i + 1), queue de probabilité < epsilon ignorée
+    if faces <= 1:
+        return np.ones(1)
+    levels = 1
+    while (1 / faces) ** (levels + 1) >= epsilon:
+        levels += 1
+    probs = np.zeros(levels * faces)
+    for level in range(levels):
+        # k*faces + 1 ... k*faces + faces-1 : le dé s'arrête au niveau k
+        probs[level * faces:level * faces + faces - 1] = (1 / faces) ** (level + 1)
+    return probs
+
+@lru_cache(maxsize=1024)
+def dice_distribution(
+    expression: DiceExpression,
+    karma_faces: Optional[int] = None,
+    epsilon: float = PROBABILITY_EPSILON
+) -> Distribution:
+    faces_list = [faces for faces, _ in expression.dice]
+    if karma_faces:
+        faces_list.append(karma_faces)
+
+    probs = np.ones(1)
+    for faces in faces_list:
+        probs = np.convolve(probs, exploding_die_pmf(faces, epsilon))
+
+    # Chaque dé vaut au moins 1
+    offset = len(faces_list) + expression.modifier
+    at_least = np.cumsum(probs[::-1])[::-1]
+    return Distribution(offset, probs, at_least)
+
+@lru_cache(maxsize=1024)
+def compile_dice_expression(des: str) -> DiceExpression:
+    groups = tuple(
+        (int(count) if count else 1, int(faces))
+        for count, faces in DICE_GROUP_PATTERN.findall(des)
+    )
+
+    modifier = 0
+    modifier_match = DICE_MODIFIER_PATTERN.search(des)
+    if modifier_match:
+        sign, value = modifier_match.groups()
+        modifier = -int(value) if sign == '-' else int(value)
+
+    return make_dice_expression(groups, modifier)
+
+def make_dice_expression(groups: Tuple[Tuple[int, int], ...], modifier: int) -> DiceExpression:
+    dice = tuple(
+        (faces, f" (D{faces})")
+        for count, faces in groups
+        for _ in range(count)
+    )
+    return DiceExpression(groups, modifier, dice)
+
+def is_classified(classification: Any) -> bool:
+    return isinstance(classification, (int, float)) and classification > 0
+
+class Talent:
+    __slots__ = ('name', 'niv_tot', 'des', 'karma', 'classification', 'expression')
+
+    def __init__(
+        self,
+        name: str,
+        niv_tot: float,
+        des: str,
+        karma: bool,
+        classification: float,
+        expression: DiceExpression
+    ):
+        self.name = name
+        self.niv_tot = niv_tot
+        self.des = sys.intern(des)  # les mêmes dés reviennent sur toutes les fiches
+        self.karma = karma
+        self.classification = classification
+        self.expression = expression
+
+class TalentRow(NamedTuple):
+    # Ligne de zone déjà validée, prête pour TalentCache
+    talent: str
+    niv_tot: float
+    des: str
+    karma: bool
+    classification: Any
+
 class TalentCache:
     def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._cache: Dict[str, Talent] = {}
+        # Tenus à jour à chaque ajout : liste triée des noms et colonnes de boutons
+        self._names: List[str] = []
+        self._buckets: Dict[int, List[Tuple[float, str]]] = {}  # (-classification, talent) triés
+        self._search_index: Optional[TalentSearchIndex] = None
+
+    def _store(self, talent: Talent):
+        old = self._cache.get(talent.name)
+        if old is None:
+            bisect.insort(self._names, talent.name)
+        elif is_classified(old.classification):
+            bucket = self._buckets[int(old.classification)]
+            del bucket[bisect.bisect_left(bucket, (-old.classification, old.name))]
+        self._cache[talent.name] = talent
+        if is_classified(talent.classification):
+            bisect.insort(
+                self._buckets.setdefault(int(talent.classification), []),
+                (-talent.classification, talent.name)
+            )
 
     def add_talent(self, talent: str, niv_tot: float, des: str, 
                   karma: bool, classification: float) -> bool:
         if talent in self._cache:
-            if niv_tot <= self._cache[talent]['niv_tot']:
+            if niv_tot <= self._cache[talent].niv_tot:
                 return False
-        self._cache[talent] = {
-            'niv_tot': niv_tot,
-            'des': des,
-            'karma': karma,
-            'classification': classification
-        }
+        self._search_index = None
+        self._store(Talent(talent, niv_tot, des, karma, classification, compile_dice_expression(des)))
         return True
 
-    def get_talent(self, talent: str) -> Optional[Dict[str, Any]]:
+    def add_talent_rows(self, rows: Iterator[TalentRow]) -> int:
+        # Un talent de discipline "X (D)" masque la compétence "X" ; le plus haut Niv. Tot. l'emporte
+        added = 0
+        for talent, niv_tot, des, karma, classification in rows:
+            if not karma and talent + KARMA_SUFFIX in self._cache:
+                continue
+            added += self.add_talent(talent, niv_tot, des, karma, classification)
+        return added
+
+    def to_records(self) -> List[Tuple[Any, ...]]:
+        # Types natifs uniquement : (talent, niv_tot, des, karma, classification, groupes, modificateur)
+        return [
+            (talent, data.niv_tot, data.des, data.karma, data.classification,
+             data.expression.groups, data.expression.modifier)
+            for talent, data in self._cache.items()
+        ]
+
+    @classmethod
+    def from_records(cls, records: List[Tuple[Any, ...]]) -> 'TalentCache':
+        return cls.from_talents(
+            Talent(talent, niv_tot, des, karma, classification, make_dice_expression(groups, modifier))
+            for talent, niv_tot, des, karma, classification, groups, modifier in records
+        )
+
+    @classmethod
+    def from_talents(cls, talents: Iterator[Talent]) -> 'TalentCache':
+        talent_cache = cls()
+        for talent in talents:
+            talent_cache._cache[talent.name] = talent
+
+        # Index triés construits en une fois plutôt que talent par talent
+        talent_cache._names = sorted(talent_cache._cache)
+        for talent, data in talent_cache._cache.items():
+            if is_classified(data.classification):
+                talent_cache._buckets.setdefault(int(data.classification), []).append(
+                    (-data.classification, talent)
+                )
+        for bucket in talent_cache._buckets.values():
+            bucket.sort()
+        return talent_cache
+
+    def diff(self, other: 'TalentCache') -> Tuple[List[str], List[str], List[str]]:
+        # Talents ajoutés, supprimés et modifiés pour passer de self à other
+        def same(a: Any, b: Any) -> bool:
+            return a == b or (isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b))
+
+        added = [talent for talent in other._cache if talent not in self._cache]
+        removed = [talent for talent in self._cache if talent not in other._cache]
+        changed = [
+            talent for talent, data in other._cache.items()
+            if talent in self._cache and not all(
+                same(getattr(data, key), getattr(self._cache[talent], key))
+                for key in ('niv_tot', 'des', 'karma', 'classification')
+            )
+        ]
+        return added, removed, changed
+
+    @property
+    def search_index(self) -> TalentSearchIndex:
+        if self._search_index is None:
+            with perf.timer('search_index'):
+                self._search_index = TalentSearchIndex(self._cache)
+        return self._search_index
+
+    def get_talent(self, talent: str) -> Optional[Talent]:
         return self._cache.get(talent)
 
     def get_all_talents(self) -> List[str]:
-        return sorted(self._cache.keys())
+        return list(self._names)
+
+    def get_classification_column(self, column: int) -> List[str]:
+        # Classification décroissante puis ordre alphabétique
+        return [talent for _, talent in self._buckets.get(column, ())]
 
     def get_classified_talents(self) -> List[Tuple[str, float]]:
-        return [(talent, data['classification']) 
-                for talent, data in self._cache.items() 
-                if isinstance(data['classification'], (int, float)) 
-                and data['classification'] > 0]
+        return sorted(
+            ((talent, -negated) for bucket in self._buckets.values() for negated, talent in bucket),
+            key=lambda x: (-x[1], x[0])
+        )
 
 class Config:
     def __init__(self, filename: str = 'dice_roller_config.json'):
@@ -143,11 +878,13 @@ class Config:
         try:
             with open(self.filename, 'r', encoding= 'utf-8') as f:
                 config = json.load(f)
-                default_config = self.get_default_config()
-                default_config.update(config)
-                return default_config
+                data = self.get_default_config()
+                data.update(config)
         except FileNotFoundError:
-            return self.get_default_config()
+            data = self.get_default_config()
+        # Talents de la configuration compilés une fois, réutilisés à chaque chargement de fiche
+        self.config_talents = config_talent_rows(data)
+        return data
 
     def save(self):
         with open(self.filename, 'w', encoding= 'utf-8') as f:
@@ -158,27 +895,1782 @@ class Config:
         return {
             'default_karma_die': DEFAULT_KARMA_DIE,
             'max_history_size': MAX_HISTORY_SIZE,
+            'quick_button_columns': QUICK_BUTTON_COLUMNS,
+            'quick_button_rows': QUICK_BUTTON_ROWS,
             'ui_theme': UI_THEME,
             'window_size': WINDOW_SIZE,
             'excel_zones': EXCEL_ZONES,
             'substitute_talent_column_name': SUBSTITUTE_TALENT_COLUMN_NAME,
-            'required_columns': REQUIRED_COLUMNS
+            'required_columns': REQUIRED_COLUMNS,
+            'probability_epsilon': PROBABILITY_EPSILON,
+            'watch_interval_ms': WATCH_INTERVAL_MS,
+            'rng_backend': RNG_BACKEND,
+            'rng_seed': None,
+            'log_level': LOG_LEVEL
+        }
+
+def warm_up_numpy():
+    np.load()
+
+def read_zone_frames_per_zone(
+    file_path: str,
+    excel_zones: Dict[str, List[Tuple[int, int]]]
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Un pd.read_excel par zone : fiches .xls, que la lecture en flux ne gère pas."""
+    with pd.ExcelFile(file_path) as xls:
+        for sheet_name, zones in excel_zones.items():
+            if sheet_name not in xls.sheet_names:
+                continue
+
+            for start, end in zones:
+                with perf.timer('zone_read'):
+                    df = pd.read_excel(
+                        xls,
+                        sheet_name,
+                        skiprows=start-1,
+                        nrows=end-start+1,
+                        usecols=EXCEL_USECOLS
+                    )
+                yield sheet_name, df
+
+def config_talent_rows(config_data: Dict[str, Any]) -> Tuple[TalentRow, ...]:
+    """Talents définis dans la configuration (damage_buttons) ; Config.load les compile une fois."""
+    rows = []
+    for button_name, button_data in config_data.get('damage_buttons', {}).items():
+        try:
+            row = TalentRow(
+                button_data['Talents'],
+                float(button_data['Niv. Tot.']),
+                button_data['Dés'],
+                button_data['Talents'].endswith(KARMA_SUFFIX),
+                float(button_data['Classification'])
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Bouton de dommages ignoré : %s (%r)", button_name, e)
+            continue
+        logger.debug("Bouton de dommages %s : %s", button_name, row)
+        rows.append(row)
+    return tuple(rows)
+
+def merge_config_talents(talent_cache: TalentCache, config_talents: Sequence[TalentRow]):
+    # Une seule fois par fiche, après toutes les zones
+    added = talent_cache.add_talent_rows(config_talents)
+    logger.debug("Talents de la configuration : %d ajoutés sur %d", added, len(config_talents))
+
+def read_shared_strings(archive: zipfile.ZipFile, member: Optional[str]) -> List[str]:
+    strings: List[str] = []
+    if member is None:
+        return strings
+
+    text_tag = f'{XLSX_MAIN_NS}t'
+    with archive.open(member) as f:
+        for _, element in ElementTree.iterparse(f):
+            if element.tag != f'{XLSX_MAIN_NS}si':
+                continue
+            text = element.find(text_tag)
+            if text is None:  # texte enrichi : concaténation des <r><t>, sans la phonétique
+                strings.append(''.join(
+                    run.findtext(text_tag) or '' for run in element.iter(f'{XLSX_MAIN_NS}r')
+                ))
+            else:
+                strings.append(text.text or '')
+            element.clear()
+    return strings
+
+def _column_index(reference: str) -> int:
+    # "E12" -> 5
+    index = 0
+    for char in reference:
+        if char.isdigit():
+            break
+        index = index * 26 + ord(char) - 64
+    return index
+
+def is_date_format(format_code: str) -> bool:
+    # Seule la première section compte (positifs)
+    format_code = XLSX_FORMAT_LITERAL_PATTERN.sub('', format_code.split(';')[0])
+    return XLSX_DATE_FORMAT_PATTERN.search(format_code) is not None
+
+def read_date_styles(archive: zipfile.ZipFile, member: Optional[str]) -> frozenset:
+    """Index des styles de cellule (attribut s) dont le format de nombre est une date."""
+    if member is None:
+        return frozenset()
+
+    styles = ElementTree.fromstring(archive.read(member))
+    date_formats = set(XLSX_DATE_FORMAT_IDS)
+    for number_format in styles.iter(f'{XLSX_MAIN_NS}numFmt'):
+        if is_date_format(number_format.get('formatCode', '')):
+            date_formats.add(int(number_format.get('numFmtId', -1)))
+
+    cell_formats = styles.find(f'{XLSX_MAIN_NS}cellXfs')
+    if cell_formats is None:
+        return frozenset()
+    return frozenset(
+        index for index, cell_format in enumerate(cell_formats.iter(f'{XLSX_MAIN_NS}xf'))
+        if int(cell_format.get('numFmtId', 0)) in date_formats
+    )
+
+def _excel_date(serial: float) -> Any:
+    from datetime import datetime, timedelta
+    # Calendrier 1900, avec le faux 29 février 1900 d'Excel
+    return datetime(1899, 12, 30 if serial >= 61 else 31) + timedelta(days=serial)
+
+def _xlsx_cell_value(cell: ElementTree.Element, shared_strings: List[str], date_styles: frozenset) -> Any:
+    # Mêmes valeurs que openpyxl en data_only/values_only : une date n'est pas un nombre
+    kind = cell.get('t', 'n')
+    if kind == 'inlineStr':
+        return ''.join(text.text or '' for text in cell.iter(f'{XLSX_MAIN_NS}t'))
+    value = cell.findtext(f'{XLSX_MAIN_NS}v')
+    if value is None:
+        return None
+    if kind == 's':
+        return shared_strings[int(value)]
+    if kind == 'n':
+        number = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+        return _excel_date(number) if date_styles and int(cell.get('s', 0)) in date_styles else number
+    if kind == 'b':
+        return value == '1'
+    return value  # 'str', 'e' (code d'erreur), 'd'
+
+def iter_xlsx_rows(
+    archive: zipfile.ZipFile,
+    member: str,
+    shared_strings: List[str],
+    date_styles: frozenset,
+    first_row: int,
+    last_row: int
+) -> Iterator[Tuple[int, List[Any]]]:
+    """Colonnes A:Q des lignes non vides entre first_row et last_row, lues en flux dans le XML."""
+    row_tag = f'{XLSX_MAIN_NS}row'
+    sheet_data_tag = f'{XLSX_MAIN_NS}sheetData'
+    sheet_data = None
+    row_number = 0
+    with archive.open(member) as f:
+        for event, element in ElementTree.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if element.tag == sheet_data_tag:
+                    sheet_data = element
+                continue
+            if element.tag != row_tag:
+                continue
+            row_number = int(element.get('r') or row_number + 1)
+            if row_number > last_row:
+                break
+
+            if row_number >= first_row:
+                values: List[Any] = [None] * EXCEL_LAST_COL
+                column = 0
+                for cell in element:
+                    reference = cell.get('r')
+                    column = _column_index(reference) if reference else column + 1
+                    if column <= EXCEL_LAST_COL:
+                        values[column - 1] = _xlsx_cell_value(cell, shared_strings, date_styles)
+                yield row_number, values
+            # Ne garder aucune ligne déjà lue en mémoire
+            if sheet_data is not None:
+                sheet_data.remove(element)
+
+def _zone_columns(header: Tuple[Any, ...], config_data: Dict[str, Any]) -> Optional[Tuple[int, ...]]:
+    # Index des colonnes utiles dans la ligne d'en-tête (B:Q), None s'il en manque
+    columns: Dict[str, int] = {}
+    for index, name in enumerate(header[1:EXCEL_LAST_COL], start=1):
+        if not isinstance(name, str):
+            continue
+        name = name.strip()
+        if name in config_data['substitute_talent_column_name']:
+            name = 'Talents'
+        columns.setdefault(name, index)
+
+    if not all(col in columns for col in config_data['required_columns']):
+        return None
+    return tuple(columns[col] for col in REQUIRED_COLUMNS)
+
+def _talent_row(values: Tuple[Any, ...], columns: Tuple[int, ...]) -> Optional[TalentRow]:
+    # Nom et dés en texte, Niv. Tot. numérique (les nombres saisis en texte sont refusés)
+    talent, niv_tot, des, classification = (
+        values[index] if index < len(values) else None for index in columns
+    )
+    if not isinstance(talent, str) or not isinstance(des, str) or talent in MISSING_CELL_STRINGS:
+        return None
+    if not isinstance(niv_tot, (int, float)) or niv_tot != niv_tot:  # NaN
+        return None
+    des = des.strip()
+    if not des or not DICE_REGEX.match(des):
+        return None
+
+    talent = talent.strip()
+    if classification is None or classification in MISSING_CELL_STRINGS:
+        classification = math.nan
+    return TalentRow(talent, float(niv_tot), des, talent.endswith(KARMA_SUFFIX), classification)
+
+def iter_zone_rows(
+    file_path: str,
+    excel_zones: Dict[str, List[Tuple[int, int]]],
+    config_data: Dict[str, Any]
+) -> Iterator[Tuple[str, Optional[List[TalentRow]]]]:
+    """Lit chaque feuille ligne à ligne et ne garde que les lignes de talents valides de chaque zone.
+
+    Produit (feuille, lignes) par zone dans l'ordre de la configuration ; lignes vaut None
+    si des colonnes obligatoires manquent.
+    """
+    if not file_path.lower().endswith(OPENPYXL_EXTENSIONS):
+        yield from iter_zone_rows_per_zone(file_path, excel_zones, config_data)
+        return
+
+    with zipfile.ZipFile(file_path) as archive:
+        with perf.timer('workbook_open'):
+            sheets, shared_strings_member, styles_member = xlsx_parts(archive)
+            shared_strings = read_shared_strings(archive, shared_strings_member)
+            date_styles = read_date_styles(archive, styles_member)
+
+        for sheet_name, zones in excel_zones.items():
+            if sheet_name not in sheets:
+                continue
+
+            start_time = time.perf_counter()
+            zone_columns: List[Optional[Tuple[int, ...]]] = [None] * len(zones)
+            zone_rows: List[List[TalentRow]] = [[] for _ in zones]
+            row_values = iter_xlsx_rows(
+                archive,
+                sheets[sheet_name],
+                shared_strings,
+                date_styles,
+                min(start for start, _ in zones),
+                max(end for _, end in zones) + 1
+            )
+
+            # En-tête à `start`, données de start+1 à end+1 (comme pd.read_excel)
+            for row_number, values in row_values:
+                for zone, (start, end) in enumerate(zones):
+                    if row_number == start:
+                        zone_columns[zone] = _zone_columns(values, config_data)
+                    elif start < row_number <= end + 1 and zone_columns[zone] is not None:
+                        row = _talent_row(values, zone_columns[zone])
+                        if row is not None:
+                            zone_rows[zone].append(row)
+            perf.record('sheet_read', time.perf_counter() - start_time)
+
+            for columns, rows in zip(zone_columns, zone_rows):
+                yield sheet_name, rows if columns is not None else None
+
+def iter_zone_rows_per_zone(
+    file_path: str,
+    excel_zones: Dict[str, List[Tuple[int, int]]],
+    config_data: Dict[str, Any]
+) -> Iterator[Tuple[str, Optional[List[TalentRow]]]]:
+    """Comme iter_zone_rows, zone par zone avec pandas (colonnes B:Q)."""
+    for sheet_name, df in read_zone_frames_per_zone(file_path, excel_zones):
+        columns = _zone_columns((None, *df.columns), config_data)
+        if columns is None:
+            yield sheet_name, None
+            continue
+        rows = (_talent_row((None, *values), columns) for values in df.itertuples(index=False, name=None))
+        yield sheet_name, [row for row in rows if row is not None]
+
+def read_talent_rows(
+    file_path: str,
+    config_data: Dict[str, Any],
+    sheets: Optional[List[str]] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None
+) -> Dict[str, List[List[TalentRow]]]:
+    """Lignes de talents valides par feuille et par zone, sans DataFrame ; `sheets` limite la lecture."""
+    excel_zones = {
+        sheet_name: zones
+        for sheet_name, zones in config_data['excel_zones'].items()
+        if sheets is None or sheet_name in sheets
+    }
+    total = sum(len(zones) for zones in excel_zones.values())
+    talent_rows: Dict[str, List[List[TalentRow]]] = {}
+
+    for done, (sheet_name, rows) in enumerate(iter_zone_rows(file_path, excel_zones, config_data), start=1):
+        zones = talent_rows.setdefault(sheet_name, [])
+        if rows is None:
+            logger.warning("Colonnes manquantes dans %s", sheet_name)
+        else:
+            zones.append(rows)
+
+        if progress:
+            progress(done, total, sheet_name)
+
+    return talent_rows
+
+def build_talent_cache(
+    talent_rows: Dict[str, List[List[TalentRow]]],
+    config_data: Dict[str, Any],
+    config_talents: Sequence[TalentRow]
+) -> TalentCache:
+    """Étapes après la lecture des zones : ingestion, puis talents de la configuration.
+
+    L'index de recherche, dernière étape, est construit à la demande (TalentCache.search_index).
+    """
+    # Ingestion dans l'ordre de la configuration : les règles de priorité en dépendent
+    talent_cache = TalentCache()
+    with perf.timer('ingest'):
+        for sheet_name in config_data['excel_zones']:
+            for rows in talent_rows.get(sheet_name, []):
+                talent_cache.add_talent_rows(rows)
+    with perf.timer('config_merge'):
+        merge_config_talents(talent_cache, config_talents)
+    return talent_cache
+
+def load_talent_cache(
+    file_path: str,
+    config_data: Dict[str, Any],
+    config_talents: Sequence[TalentRow],
+    progress: Optional[Callable[[int, int, str], None]] = None
+) -> TalentCache:
+    """Construit un nouveau TalentCache à partir d'une fiche ; progress(fait, total, feuille)."""
+    return build_talent_cache(
+        read_talent_rows(file_path, config_data, progress=progress), config_data, config_talents
+    )
+
+def xlsx_parts(archive: zipfile.ZipFile) -> Tuple[Dict[str, str], Optional[str], Optional[str]]:
+    """Chemin dans le zip de chaque feuille (par nom), des chaînes partagées et des styles."""
+    relationships = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+
+    def member(target: str) -> str:
+        return target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+
+    targets = {}
+    shared_strings = None
+    styles = None
+    for relationship in relationships.iter(f'{XLSX_PACKAGE_REL_NS}Relationship'):
+        targets[relationship.get('Id')] = member(relationship.get('Target', ''))
+        if relationship.get('Type', '').endswith('/sharedStrings'):
+            shared_strings = member(relationship.get('Target', ''))
+        elif relationship.get('Type', '').endswith('/styles'):
+            styles = member(relationship.get('Target', ''))
+
+    workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    sheets = {
+        sheet.get('name'): targets.get(sheet.get(f'{XLSX_REL_NS}id'), '')
+        for sheet in workbook.iter(f'{XLSX_MAIN_NS}sheet')
+    }
+    return sheets, shared_strings, styles
+
+def sheet_fingerprints(file_path: str) -> Optional[Dict[str, Tuple[int, int, int]]]:
+    """CRC de chaque feuille d'un .xlsx, lus dans l'index du zip sans décompresser."""
+    if not file_path.lower().endswith(OPENPYXL_EXTENSIONS):
+        return None
+
+    with zipfile.ZipFile(file_path) as archive:
+        sheets, shared_strings, styles = xlsx_parts(archive)
+        crcs = {info.filename: info.CRC for info in archive.infolist()}
+        # Une modification des chaînes partagées ou des formats peut concerner toutes les feuilles
+        shared_strings_crc = crcs.get(shared_strings, 0)
+        styles_crc = crcs.get(styles, 0)
+        return {
+            sheet_name: (crcs.get(member, 0), shared_strings_crc, styles_crc)
+            for sheet_name, member in sheets.items()
+        }
+
+class SheetWatcher:
+    """Suit une fiche ouverte et ne relit que les feuilles modifiées."""
+
+    def __init__(self, file_path: str, config_data: Dict[str, Any], config_talents: Sequence[TalentRow]):
+        self.file_path = file_path
+        self.config_data = config_data
+        self.config_talents = config_talents
+        self.mtime = os.stat(file_path).st_mtime_ns
+        self.fingerprints = sheet_fingerprints(file_path)
+        # Lignes validées par feuille et par zone ; None tant que la fiche n'a pas été relue
+        self.talent_rows: Optional[Dict[str, List[List[TalentRow]]]] = None
+
+    def has_changed(self) -> bool:
+        try:
+            return os.stat(self.file_path).st_mtime_ns != self.mtime
+        except OSError:
+            return False
+
+    def refresh(self) -> Tuple[TalentCache, List[str]]:
+        mtime = os.stat(self.file_path).st_mtime_ns
+        fingerprints = sheet_fingerprints(self.file_path)
+        sheets = list(self.config_data['excel_zones'])
+
+        if self.talent_rows is not None and fingerprints is not None and self.fingerprints is not None:
+            sheets = [
+                sheet_name for sheet_name in sheets
+                if fingerprints.get(sheet_name) != self.fingerprints.get(sheet_name)
+            ]
+
+        talent_rows = dict(self.talent_rows or {})
+        for sheet_name in sheets:
+            talent_rows.pop(sheet_name, None)
+        if sheets:
+            talent_rows.update(read_talent_rows(self.file_path, self.config_data, sheets))
+
+        self.talent_rows = talent_rows
+        self.fingerprints = fingerprints
+        self.mtime = mtime
+        return build_talent_cache(talent_rows, self.config_data, self.config_talents), sheets
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def config_fingerprint(config_data: Dict[str, Any]) -> str:
+    # Tout ce qui change le contenu du cache invalide les fiches déjà lues
+    relevant = {
+        key: config_data.get(key)
+        for key in ('excel_zones', 'required_columns', 'substitute_talent_column_name', 'damage_buttons')
+    }
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=list).encode('utf-8')).hexdigest()
+
+class SheetCache:
+    """Cache disque des fiches déjà lues, à côté du fichier de configuration."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self.data = self.load()
+
+    @classmethod
+    def for_config(cls, config: 'Config') -> 'SheetCache':
+        directory = os.path.dirname(os.path.abspath(config.filename))
+        return cls(os.path.join(directory, SHEET_CACHE_FILENAME))
+
+    def load(self) -> Dict[str, Any]:
+        # JSON plutôt que pickle : un cache abîmé ou modifié n'exécute rien, c'est un simple défaut de cache
+        empty = {'version': SHEET_CACHE_VERSION, 'last_file': None, 'entries': {}}
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return empty
+        except (OSError, ValueError, RecursionError):
+            data = None
+
+        if (
+            isinstance(data, dict)
+            and data.get('version') == SHEET_CACHE_VERSION
+            and isinstance(data.get('last_file'), (str, type(None)))
+            and isinstance(data.get('entries'), dict)
+        ):
+            return data
+
+        # Cache illisible ou d'une autre version : réécrit vide
+        self.data = empty
+        try:
+            self.save()
+        except OSError as e:
+            logger.warning("Cache non enregistré : %s", e)
+        return empty
+
+    def save(self):
+        temp_filename = self.filename + '.tmp'
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(temp_filename, self.filename)
+
+    @staticmethod
+    def _talent_cache(records: Any) -> TalentCache:
+        # Lève TypeError/ValueError si l'entrée n'a pas la forme attendue
+        talents = []
+        for talent, niv_tot, des, karma, classification in records:
+            if not isinstance(talent, str) or not isinstance(des, str) or not DICE_REGEX.match(des):
+                raise ValueError(f"Entrée de cache invalide : {talent!r}")
+            talents.append(Talent(
+                talent, float(niv_tot), des, bool(karma), classification, compile_dice_expression(des)
+            ))
+        return TalentCache.from_talents(talents)
+
+    @staticmethod
+    def _records(talent_cache: TalentCache) -> List[List[Any]]:
+        return [
+            [talent, data.niv_tot, data.des, data.karma,
+             data.classification if isinstance(data.classification, (int, float, str)) else math.nan]
+            for talent, data in ((talent, talent_cache.get_talent(talent)) for talent in talent_cache.get_all_talents())
+        ]
+
+    @property
+    def last_file(self) -> Optional[str]:
+        return self.data['last_file']
+
+    def get(self, file_path: str, config_data: Dict[str, Any]) -> Optional[TalentCache]:
+        with perf.timer('sheet_cache_get'):
+            return self._get(file_path, config_data)
+
+    def _get(self, file_path: str, config_data: Dict[str, Any]) -> Optional[TalentCache]:
+        file_path = os.path.abspath(file_path)
+        with self._lock:
+            entry = self.data['entries'].get(file_path)
+            try:
+                if not entry or entry['config'] != config_fingerprint(config_data):
+                    return None
+
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    return None
+                if stat.st_size != entry['size']:
+                    return None
+                if stat.st_mtime_ns != entry['mtime']:
+                    # Date changée : le contenu fait foi (fichier copié ou simplement touché)
+                    if file_digest(file_path) != entry['sha256']:
+                        return None
+                    entry['mtime'] = stat.st_mtime_ns
+                return self._talent_cache(entry['talents'])
+            except (KeyError, TypeError, ValueError):
+                # Entrée abîmée : oubliée, la fiche sera relue et l'entrée réécrite
+                del self.data['entries'][file_path]
+                return None
+
+    def put(self, file_path: str, config_data: Dict[str, Any], talent_cache: TalentCache):
+        self.put_many({file_path: talent_cache}, config_data)
+
+    def put_many(self, talent_caches: Dict[str, TalentCache], config_data: Dict[str, Any]):
+        with perf.timer('sheet_cache_put'):
+            self._put_many(talent_caches, config_data)
+
+    def _put_many(self, talent_caches: Dict[str, TalentCache], config_data: Dict[str, Any]):
+        # Un seul enregistrement du cache pour toutes les fiches
+        new_entries = {}
+        for file_path, talent_cache in talent_caches.items():
+            file_path = os.path.abspath(file_path)
+            stat = os.stat(file_path)
+            new_entries[file_path] = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'sha256': file_digest(file_path),
+                'config': config_fingerprint(config_data),
+                'talents': self._records(talent_cache),
+            }
+        if not new_entries:
+            return
+
+        with self._lock:
+            entries = self.data['entries']
+            for file_path, entry in new_entries.items():
+                entries.pop(file_path, None)
+                entries[file_path] = entry
+                self.data['last_file'] = file_path
+            while len(entries) > MAX_CACHED_SHEETS:
+                del entries[next(iter(entries))]
+            self.save()
+
+    def remember_last_file(self, file_path: str):
+        with self._lock:
+            self.data['last_file'] = os.path.abspath(file_path)
+            self.save()
+
+def character_name(file_path: str) -> str:
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+def workbook_files(folder: str, extensions: Tuple[str, ...] = WORKBOOK_EXTENSIONS) -> List[str]:
+    # Les fichiers "~$..." sont les verrous d'Excel sur les fiches ouvertes
+    return sorted(
+        os.path.join(folder, name)
+        for name in os.listdir(folder)
+        if name.lower().endswith(extensions) and not name.startswith('~$')
+    )
+
+def is_native_sheet(file_path: str) -> bool:
+    return file_path.lower().endswith(NATIVE_SHEET_EXTENSION)
+
+def character_sheet_files(folder: str) -> List[str]:
+    """Fiches d'un dossier ; une fiche native remplace la fiche Excel du même nom (déjà convertie),
+    sauf si celle-ci a été modifiée depuis l'export."""
+    file_paths = workbook_files(folder, WORKBOOK_EXTENSIONS + (NATIVE_SHEET_EXTENSION,))
+    workbooks = {character_name(file_path) for file_path in file_paths if not is_native_sheet(file_path)}
+    stale = set()
+    for file_path in file_paths:
+        if not is_native_sheet(file_path) or character_name(file_path) not in workbooks:
+            continue
+        try:
+            source_path = native_sheet_source(file_path, read_native_metadata(file_path))
+        except (OSError, ValueError) as e:
+            logger.warning("%s ignorée, la fiche Excel est utilisée : %s", os.path.basename(file_path), e)
+            stale.add(file_path)
+            continue
+        if source_path:
+            logger.warning(
+                "%s a été modifiée depuis l'export de %s : la fiche Excel est utilisée",
+                os.path.basename(source_path), os.path.basename(file_path)
+            )
+            stale.add(file_path)
+
+    native = {
+        character_name(file_path) for file_path in file_paths
+        if is_native_sheet(file_path) and file_path not in stale
+    }
+    return [
+        file_path for file_path in file_paths
+        if file_path not in stale and (is_native_sheet(file_path) or character_name(file_path) not in native)
+    ]
+
+def write_native_sheet(file_path: str, talent_cache: TalentCache, metadata: Dict[str, Any]):
+    talents = [talent_cache.get_talent(name) for name in talent_cache.get_all_talents()]
+    strings = '\0'.join([talent.name for talent in talents] + [talent.des for talent in talents]).encode('utf-8')
+    metadata = json.dumps({**metadata, 'count': len(talents)}, ensure_ascii=False).encode('utf-8')
+    records = b''.join(
+        NATIVE_TALENT_RECORD.pack(
+            talent.niv_tot,
+            float(talent.classification) if isinstance(talent.classification, (int, float)) else math.nan,
+            talent.karma
+        )
+        for talent in talents
+    )
+
+    # Fichier temporaire puis remplacement : jamais de fiche native à moitié écrite
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(NATIVE_SHEET_HEADER.pack(NATIVE_SHEET_MAGIC, NATIVE_SHEET_VERSION, len(metadata), len(strings)))
+        f.write(metadata)
+        f.write(strings)
+        f.write(records)
+    os.replace(temp_path, file_path)
+
+def _native_sheet_header(data: bytes, file_path: str) -> Tuple[int, int]:
+    # Octets de métadonnées et de chaînes, après vérification du magique et de la version
+    if len(data) < NATIVE_SHEET_HEADER.size:
+        raise ValueError(f"Fiche native invalide : {file_path}")
+    magic, version, metadata_size, strings_size = NATIVE_SHEET_HEADER.unpack_from(data)
+    if magic != NATIVE_SHEET_MAGIC:
+        raise ValueError(f"Fiche native invalide : {file_path}")
+    if version != NATIVE_SHEET_VERSION:
+        raise ValueError(f"Version de fiche native non gérée : {version}")
+    return metadata_size, strings_size
+
+def read_native_metadata(file_path: str) -> Dict[str, Any]:
+    """Métadonnées d'une fiche native, sans lire les talents."""
+    with open(file_path, 'rb') as f:
+        metadata_size, _ = _native_sheet_header(f.read(NATIVE_SHEET_HEADER.size), file_path)
+        return json.loads(f.read(metadata_size).decode('utf-8'))
+
+def native_sheet_source(file_path: str, metadata: Dict[str, Any]) -> Optional[str]:
+    """Fiche Excel d'origine, à côté de la fiche native, si elle a changé depuis l'export."""
+    source = metadata.get('source')
+    if not source:
+        return None
+    source_path = os.path.join(os.path.dirname(file_path), os.path.basename(source))
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        return None
+    if (stat.st_size, stat.st_mtime_ns) == (metadata.get('source_size'), metadata.get('source_mtime')):
+        return None
+    # Date modifiée par une copie ou une synchronisation : le contenu tranche
+    if stat.st_size == metadata.get('source_size') and file_digest(source_path) == metadata.get('source_sha256'):
+        return None
+    return source_path
+
+def read_native_sheet(file_path: str) -> Tuple[TalentCache, Dict[str, Any]]:
+    """Relit une fiche native : (talents, métadonnées de la fiche d'origine)."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    metadata_size, strings_size = _native_sheet_header(data, file_path)
+    offset = NATIVE_SHEET_HEADER.size
+    metadata = json.loads(data[offset:offset + metadata_size].decode('utf-8'))
+    offset += metadata_size
+    count = metadata['count']
+    strings = data[offset:offset + strings_size].decode('utf-8').split('\0') if count else []
+    offset += strings_size
+    if len(strings) != 2 * count or len(data) - offset != count * NATIVE_TALENT_RECORD.size:
+        raise ValueError(f"Fiche native tronquée : {file_path}")
+
+    talent_cache = TalentCache.from_talents(
+        Talent(name, niv_tot, des, bool(karma), classification, compile_dice_expression(des))
+        for name, des, (niv_tot, classification, karma) in zip(
+            strings[:count],
+            strings[count:],
+            NATIVE_TALENT_RECORD.iter_unpack(data[offset:])
+        )
+    )
+    return talent_cache, metadata
+
+def export_native_sheet(
+    source_path: str,
+    talent_cache: TalentCache,
+    config_data: Dict[str, Any],
+    file_path: Optional[str] = None
+) -> str:
+    """Écrit les talents lus dans `source_path` au format natif, à côté de la fiche par défaut."""
+    file_path = file_path or os.path.splitext(source_path)[0] + NATIVE_SHEET_EXTENSION
+    stat = os.stat(source_path)
+    write_native_sheet(file_path, talent_cache, {
+        'character': character_name(source_path),
+        'source': os.path.basename(source_path),
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime_ns,
+        'source_sha256': file_digest(source_path),
+        'config': config_fingerprint(config_data),
+        'exported': time.time(),
+    })
+    return file_path
+
+def convert_workbooks(
+    file_paths: List[str],
+    config_data: Dict[str, Any],
+    config_talents: Sequence[TalentRow],
+    output_dir: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> Tuple[List[str], Dict[str, Exception]]:
+    """Convertit des fiches Excel au format natif ; renvoie les fichiers écrits et les erreurs par fiche."""
+    talent_caches, errors = load_workbooks(file_paths, config_data, config_talents, max_workers=max_workers)
+    written = []
+    for source_path, talent_cache in talent_caches.items():
+        target = None
+        if output_dir:
+            target = os.path.join(output_dir, character_name(source_path) + NATIVE_SHEET_EXTENSION)
+        try:
+            written.append(export_native_sheet(source_path, talent_cache, config_data, target))
+        except OSError as e:
+            errors[source_path] = e
+    return written, errors
+
+def parse_workbook(
+    file_path: str,
+    config_data: Dict[str, Any],
+    config_talents: Sequence[TalentRow]
+) -> List[Tuple[Any, ...]]:
+    """Exécuté dans un processus de travail : renvoie la table de talents sérialisée."""
+    return load_talent_cache(file_path, config_data, config_talents).to_records()
+
+def load_workbooks(
+    file_paths: List[str],
+    config_data: Dict[str, Any],
+    config_talents: Sequence[TalentRow],
+    sheet_cache: Optional[SheetCache] = None,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None
+) -> Tuple[Dict[str, TalentCache], Dict[str, Exception]]:
+    """Charge plusieurs fiches, une par processus ; renvoie les caches et les erreurs par fiche."""
+    start_time = time.perf_counter()
+    talent_caches: Dict[str, TalentCache] = {}
+    errors: Dict[str, Exception] = {}
+    pending = []
+    for file_path in file_paths:
+        if is_native_sheet(file_path):
+            try:
+                talent_caches[file_path], _ = read_native_sheet(file_path)
+            except (OSError, ValueError) as e:
+                errors[file_path] = e
+            continue
+        talent_cache = sheet_cache.get(file_path, config_data) if sheet_cache else None
+        if talent_cache is None:
+            pending.append(file_path)
+        else:
+            talent_caches[file_path] = talent_cache
+
+    done = len(talent_caches) + len(errors)
+    parsed: Dict[str, TalentCache] = {}
+    if pending:
+        # La lecture xlsx est liée au CPU : des processus plutôt que des threads (GIL)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(parse_workbook, file_path, config_data, config_talents): file_path
+                for file_path in pending
+            }
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    parsed[file_path] = TalentCache.from_records(future.result())
+                except Exception as e:
+                    errors[file_path] = e
+                done += 1
+                if progress:
+                    progress(done, len(file_paths), os.path.basename(file_path))
+
+    if sheet_cache and parsed:
+        try:
+            sheet_cache.put_many(parsed, config_data)
+        except OSError as e:
+            logger.warning("Cache non enregistré : %s", e)
+
+    talent_caches.update(parsed)
+    perf.record('load_workbooks', time.perf_counter() - start_time)
+    # Dans l'ordre demandé
+    return {path: talent_caches[path] for path in file_paths if path in talent_caches}, errors
+
+@contextlib.contextmanager
+def locked_file(filename: str) -> Iterator[None]:
+    # Verrou exclusif entre processus, libéré à la fermeture du fichier
+    with open(filename, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class RollLog:
+    """Journal des lancers en ajout seul : enregistrements binaires de taille fixe.
+
+    <base>.bin : un ROLL_RECORD par lancer
+    <base>.dice32 : un DIE_RECORD par dé
+    <base>.talents : un nom de talent par ligne (log_talent_line), l'identifiant est le numéro de ligne
+
+    Plusieurs processus peuvent écrire dans le même journal (interface et --serve) :
+    identifiants et positions ne sont attribués qu'à l'écriture, sous verrou de fichier.
+    """
+
+    def __init__(self, base_filename: str):
+        self.base_filename = base_filename
+        self.records_filename = base_filename + '.bin'
+        # Anciennement .dice (deux octets par dé) : les positions des anciens lancers y pointent encore
+        self.dice_filename = base_filename + '.dice32'
+        self.talents_filename = base_filename + '.talents'
+        self.lock_filename = base_filename + '.lock'
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: List[Tuple[float, str, int, Sequence[Tuple[int, int, bool]], int, bool]] = []
+        self._closed = False
+
+        # Talents déjà lus dans le fichier ; complétés à chaque écriture
+        self.talent_ids: Dict[str, int] = {}
+        self._talent_count = 0
+        self._talents_offset = 0
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def for_config(cls, config: 'Config') -> 'RollLog':
+        directory = os.path.dirname(os.path.abspath(config.filename))
+        return cls(os.path.join(directory, ROLL_LOG_FILENAME))
+
+    def append(self, talent: str, result: RollResult, timestamp: Optional[float] = None):
+        # Simple mise en file : l'encodage et l'écriture se font dans le thread du journal
+        explosions = sum(1 for faces, value, _ in result.dice if value == faces and faces > 1)
+        karma = any(karma for _, _, karma in result.dice)
+
+        with self._lock:
+            self._pending.append((
+                time.time() if timestamp is None else timestamp,
+                talent,
+                result.total,
+                tuple(result.dice),
+                explosions,
+                karma
+            ))
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        try:
+            with locked_file(self.lock_filename):
+                self._write(pending)
+        except OSError:
+            # Rien n'est référencé tant que les enregistrements ne sont pas écrits : on réessaiera
+            with self._lock:
+                self._pending[:0] = pending
+            raise
+
+    def _read_new_talents(self):
+        # Talents ajoutés par les autres processus depuis la dernière écriture
+        try:
+            with open(self.talents_filename, 'rb') as f:
+                f.seek(self._talents_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b'\n') + 1
+        for talent in parse_log_talents(data[:end]):
+            self.talent_ids.setdefault(talent, self._talent_count)
+            self._talent_count += 1
+        self._talents_offset += end
+
+    def _write(self, pending: List[Tuple[float, str, int, Sequence[Tuple[int, int, bool]], int, bool]]):
+        self._read_new_talents()
+
+        # Un dé à moitié écrit (arrêt brutal) décalerait toutes les positions suivantes
+        try:
+            dice_size = os.path.getsize(self.dice_filename)
+        except FileNotFoundError:
+            dice_size = 0
+        if dice_size % DIE_RECORD.size:
+            dice_size -= dice_size % DIE_RECORD.size
+            os.truncate(self.dice_filename, dice_size)
+        dice_offset = dice_size // DIE_RECORD.size
+
+        new_talents = []
+        records = []
+        dice_data = []
+        for timestamp, talent, total, dice, explosions, karma in pending:
+            talent_id = self.talent_ids.get(talent, self._talent_count)
+            try:
+                record = ROLL_RECORD.pack(
+                    timestamp, talent_id, total, dice_offset, len(dice), explosions, karma
+                )
+                packed_dice = b''.join(
+                    DIE_RECORD.pack((faces | KARMA_DIE_FLAG) if die_karma else faces, value)
+                    for faces, value, die_karma in dice
+                )
+            except struct.error as e:
+                # Total ou nombre de dés hors format : ce lancer seul n'est pas journalisé
+                logger.warning("Lancer de %r non journalisé : %s", talent, e)
+                continue
+            if talent_id == self._talent_count:
+                self.talent_ids[talent] = talent_id
+                self._talent_count += 1
+                new_talents.append(talent)
+            records.append(record)
+            dice_data.append(packed_dice)
+            dice_offset += len(dice)
+
+        # Les enregistrements en dernier : ils ne pointent jamais vers des données absentes
+        if new_talents:
+            data = b''.join(log_talent_line(talent) for talent in new_talents)
+            with open(self.talents_filename, 'ab') as f:
+                f.write(data)
+            self._talents_offset += len(data)
+        with open(self.dice_filename, 'ab') as f:
+            f.write(b''.join(dice_data))
+        with open(self.records_filename, 'ab') as f:
+            f.write(b''.join(records))
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wakeup.wait(ROLL_LOG_FLUSH_S)
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning("Journal des lancers non enregistré : %s", e)
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self._writer.join()
+        self.flush()
+
+def log_talent_line(talent: str) -> bytes:
+    # Un nom saisi avec Alt+Entrée ne doit pas décaler les identifiants des lignes suivantes
+    escaped = talent.replace('\\', '\\\\').replace('\n', '\\n').replace('\r', '\\r')
+    return (escaped + '\n').encode('utf-8')
+
+def _unescape_log_talent(match: re.Match) -> str:
+    return {'n': '\n', 'r': '\r'}.get(match.group(1), '\\')
+
+def parse_log_talents(data: bytes) -> List[str]:
+    # Découpage sur \n uniquement (pas splitlines : \x85, \u2028... restent dans le nom) ;
+    # \r final : anciens journaux écrits en mode texte sous Windows.
+    # Une dernière ligne sans \n est en cours d'écriture et ignorée.
+    return [
+        LOG_TALENT_ESCAPE_PATTERN.sub(_unescape_log_talent, line.removesuffix(b'\r').decode('utf-8', 'replace'))
+        for line in data.split(b'\n')[:-1]
+    ]
+
+def read_log_talents(talents_filename: str) -> List[str]:
+    try:
+        with open(talents_filename, 'rb') as f:
+            return parse_log_talents(f.read())
+    except FileNotFoundError:
+        return []
+
+def roll_record_dtype() -> np.dtype:
+    dtype = np.dtype([
+        ('time', '<f8'),
+        ('talent', '<u4'),
+        ('total', '<i4'),
+        ('dice_offset', '<u8'),
+        ('dice_count', '<u2'),
+        ('explosions', '<u2'),
+        ('karma', 'u1'),
+    ])
+    assert dtype.itemsize == ROLL_RECORD.size
+    return dtype
+
+def map_roll_log(base_filename: str) -> np.ndarray:
+    # Projection mémoire : rien n'est converti en objets Python
+    dtype = roll_record_dtype()
+    filename = base_filename + '.bin'
+    try:
+        count = os.path.getsize(filename) // dtype.itemsize  # ignore un enregistrement tronqué
+    except OSError:
+        count = 0
+    if not count:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode='r', shape=(count,))
+
+def roll_log_statistics(
+    base_filename: str,
+    since: Optional[float] = None,
+    until: Optional[float] = None
+) -> Dict[str, Dict[str, float]]:
+    """Statistiques par talent : nombre de lancers, moyenne, taux d'explosion par dé, part des lancers avec karma."""
+    records = map_roll_log(base_filename)
+    if since is not None or until is not None:
+        times = records['time']
+        mask = np.ones(len(records), dtype=bool)
+        if since is not None:
+            mask &= times >= since
+        if until is not None:
+            mask &= times < until
+        records = records[mask]
+
+    talents = read_log_talents(base_filename + '.talents')
+    size = max(len(talents), int(records['talent'].max()) + 1 if len(records) else 0)
+    talent_ids = records['talent']
+    rolls = np.bincount(talent_ids, minlength=size)
+    totals = np.bincount(talent_ids, weights=records['total'], minlength=size)
+    explosions = np.bincount(talent_ids, weights=records['explosions'], minlength=size)
+    dice = np.bincount(talent_ids, weights=records['dice_count'], minlength=size)
+    karma = np.bincount(talent_ids, weights=records['karma'], minlength=size)
+    base_dice = dice - explosions
+
+    statistics = {}
+    for talent_id in np.nonzero(rolls)[0]:
+        name = talents[talent_id] if talent_id < len(talents) else f"#{talent_id}"
+        statistics[name] = {
+            'rolls': int(rolls[talent_id]),
+            'mean': float(totals[talent_id] / rolls[talent_id]),
+            'explosion_rate': float(explosions[talent_id] / base_dice[talent_id]) if base_dice[talent_id] else 0.0,
+            'karma_rate': float(karma[talent_id] / rolls[talent_id]),
+        }
+    return statistics
+
+class SimulationResult(NamedTuple):
+    rows: List[Tuple[str, Optional[int]]]  # (talent, faces du dé de karma ou None)
+    targets: List[int]
+    probabilities: np.ndarray  # P(résultat >= seuil), une ligne par talent
+    means: np.ndarray
+    explosion_rates: np.ndarray  # part des lancers avec au moins une explosion
+    rolls: int
+    seed: int
+
+    def to_csv(self, file_path: str):
+        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            self.write_csv(f)
+
+    def write_csv(self, f):
+        writer = csv.writer(f)
+        writer.writerow(
+            ['Talent', 'Karma', 'Moyenne', 'Explosions']
+            + [f"SD {target}" for target in self.targets]
+        )
+        for (talent, karma_faces), probabilities, mean, explosion_rate in zip(
+            self.rows, self.probabilities, self.means, self.explosion_rates
+        ):
+            writer.writerow(
+                [talent, f"D{karma_faces}" if karma_faces else "", f"{mean:.2f}", f"{explosion_rate:.4f}"]
+                + [f"{probability:.4f}" for probability in probabilities]
+            )
+
+def simulate_shard(
+    tasks: List[Tuple[DiceExpression, Optional[int], np.random.SeedSequence]],
+    n: int,
+    targets: List[int]
+) -> List[Tuple[np.ndarray, float, float]]:
+    """Exécuté dans un processus de travail : un flux aléatoire indépendant par ligne."""
+    results = []
+    for expression, karma_faces, seed_sequence in tasks:
+        rng = np.random.default_rng(seed_sequence)
+        explosions = np.zeros(n, dtype=np.int64)
+        totals = np.sort(expression.roll_many(n, karma_faces, rng, explosions))
+        below = np.searchsorted(totals, targets, side='left')
+        results.append((1.0 - below / n, float(totals.mean()), float(np.count_nonzero(explosions) / n)))
+    return results
+
+def simulate_talents(
+    talent_cache: TalentCache,
+    targets: List[int],
+    karma_dice: Optional[str] = None,
+    n: int = SIMULATION_ROLLS,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    talents: Optional[List[str]] = None
+) -> SimulationResult:
+    """Matrice talent x seuil de difficulté ; les talents à karma ont aussi une ligne avec karma.
+
+    Le résultat ne dépend que de la graine, pas du nombre de processus.
+    """
+    karma_faces = int(karma_dice[1:]) if karma_dice else None
+    rows: List[Tuple[str, Optional[int]]] = []
+    expressions = []
+    for talent in talents if talents is not None else talent_cache.get_all_talents():
+        talent_data = talent_cache.get_talent(talent)
+        rows.append((talent, None))
+        expressions.append(talent_data.expression)
+        if talent_data.karma and karma_faces:
+            rows.append((talent, karma_faces))
+            expressions.append(talent_data.expression)
+
+    seed_sequence = np.random.SeedSequence(seed)
+    tasks = [
+        (expression, row_karma, child)
+        for expression, (_, row_karma), child in zip(expressions, rows, seed_sequence.spawn(len(rows)))
+    ]
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        results = simulate_shard(tasks, n, targets)
+    else:
+        shard_count = workers * SIMULATION_SHARDS_PER_WORKER
+        shards = [tasks[index::shard_count] for index in range(shard_count)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_results = list(executor.map(simulate_shard, shards, [n] * shard_count, [targets] * shard_count))
+        # Remise dans l'ordre des lignes
+        results = [None] * len(tasks)
+        for index, shard_result in enumerate(shard_results):
+            results[index::shard_count] = shard_result
+
+    return SimulationResult(
+        rows,
+        list(targets),
+        np.array([probabilities for probabilities, _, _ in results]).reshape(len(rows), len(targets)),
+        np.array([mean for _, mean, _ in results]),
+        np.array([explosion_rate for _, _, explosion_rate in results]),
+        n,
+        seed_sequence.entropy
+    )
+
+class SimulationWindow:
+    """Fenêtre de simulation : chances de réussite de toute la fiche contre une plage de seuils."""
+
+    def __init__(self, app: 'DiceRollerApp'):
+        self.app = app
+        self.result: Optional[SimulationResult] = None
+        self.window = tk.Toplevel(app.root)
+        self.window.title('Simulation')
+        self.window.geometry('900x500')
+
+        settings = ttk.Frame(self.window)
+        settings.pack(fill=tk.X, padx=10, pady=10)
+
+        self.min_target_var = tk.StringVar(value=str(SIMULATION_TARGETS[0]))
+        self.max_target_var = tk.StringVar(value=str(SIMULATION_TARGETS[1]))
+        self.rolls_var = tk.StringVar(value=str(SIMULATION_ROLLS))
+        self.seed_var = tk.StringVar()
+        for label, variable, width in (
+            ("SD de", self.min_target_var, 5),
+            ("à", self.max_target_var, 5),
+            ("Lancers", self.rolls_var, 9),
+            ("Graine", self.seed_var, 12),
+        ):
+            ttk.Label(settings, text=label).pack(side=tk.LEFT, padx=(5, 2))
+            ttk.Entry(settings, textvariable=variable, width=width).pack(side=tk.LEFT)
+
+        self.run_button = ttk.Button(settings, text="Simuler", command=self.start)
+        self.run_button.pack(side=tk.LEFT, padx=10)
+        self.export_button = ttk.Button(settings, text="Exporter CSV", command=self.export, state=tk.DISABLED)
+        self.export_button.pack(side=tk.LEFT)
+
+        self.status_label = ttk.Label(self.window)
+        self.status_label.pack(fill=tk.X, padx=10)
+
+        table_frame = ttk.Frame(self.window)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.table = ttk.Treeview(table_frame, show='headings')
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
+        self.table.configure(yscrollcommand=scrollbar.set)
+        self.table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def start(self):
+        try:
+            targets = list(range(int(self.min_target_var.get()), int(self.max_target_var.get()) + 1))
+            n = int(self.rolls_var.get())
+            seed = int(self.seed_var.get()) if self.seed_var.get().strip() else None
+        except ValueError:
+            messagebox.showerror("Erreur", "Seuils, lancers et graine doivent être des nombres entiers", parent=self.window)
+            return
+        if not targets or n <= 0:
+            return
+
+        self.run_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Simulation en cours...")
+        result_queue: queue.Queue = queue.Queue()
+
+        def worker():
+            try:
+                result_queue.put(simulate_talents(
+                    self.app.engine.talent_cache,
+                    targets,
+                    self.app.karma_combo.get(),
+                    n,
+                    seed
+                ))
+            except Exception as e:
+                result_queue.put(e)
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.window.after(LOAD_POLL_MS, self.poll, result_queue)
+
+    def poll(self, result_queue: queue.Queue):
+        try:
+            result = result_queue.get_nowait()
+        except queue.Empty:
+            self.window.after(LOAD_POLL_MS, self.poll, result_queue)
+            return
+
+        self.run_button.config(state=tk.NORMAL)
+        if isinstance(result, Exception):
+            self.status_label.config(text="")
+            messagebox.showerror("Erreur", f"Erreur lors de la simulation: {result}", parent=self.window)
+            return
+        self.show(result)
+
+    def show(self, result: SimulationResult):
+        self.result = result
+        self.export_button.config(state=tk.NORMAL)
+        self.status_label.config(text=f"{result.rolls} lancers par talent, graine {result.seed}")
+
+        columns = ['Talent', 'Moyenne', 'Explosions'] + [str(target) for target in result.targets]
+        self.table.delete(*self.table.get_children())
+        self.table.config(columns=columns)
+        for column in columns:
+            self.table.heading(column, text=column)
+            self.table.column(column, width=200 if column == 'Talent' else 55, anchor=tk.W if column == 'Talent' else tk.E)
+
+        for (talent, karma_faces), probabilities, mean, explosion_rate in zip(
+            result.rows, result.probabilities, result.means, result.explosion_rates
+        ):
+            name = f"{talent} +karma D{karma_faces}" if karma_faces else talent
+            self.table.insert('', tk.END, values=(
+                name,
+                f"{mean:.1f}",
+                f"{explosion_rate:.0%}",
+                *(f"{probability:.0%}" for probability in probabilities)
+            ))
+
+    def export(self):
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension='.csv',
+            filetypes=(("CSV", "*.csv"), ("All files", "*.*"))
+        )
+        if file_path and self.result is not None:
+            self.result.to_csv(file_path)
+
+class PerformanceWindow:
+    """Panneau caché (Ctrl+Maj+P) : latences par étape et mémoire, exportables en JSON."""
+
+    COLUMNS = ('count', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'total_ms')
+
+    def __init__(self, root: tk.Tk):
+        self.window = tk.Toplevel(root)
+        self.window.title('Performance')
+        self.window.geometry('700x350')
+
+        buttons = ttk.Frame(self.window)
+        buttons.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(buttons, text="Actualiser", command=self.refresh).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Remettre à zéro", command=self.reset).pack(side=tk.LEFT, padx=5)
+        self.memory_button = ttk.Button(buttons, command=self.toggle_memory)
+        self.memory_button.pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Exporter JSON", command=self.export).pack(side=tk.LEFT, padx=5)
+
+        self.memory_label = ttk.Label(self.window)
+        self.memory_label.pack(fill=tk.X, padx=10)
+
+        self.table = ttk.Treeview(self.window, columns=self.COLUMNS)
+        self.table.heading('#0', text='étape')
+        self.table.column('#0', width=140)
+        for column in self.COLUMNS:
+            self.table.heading(column, text=column.replace('_ms', ' (ms)'))
+            self.table.column(column, width=80, anchor=tk.E)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.refresh()
+
+    def refresh(self):
+        snapshot = perf.snapshot()
+        self.table.delete(*self.table.get_children())
+        for stage, stats in snapshot['stages'].items():
+            self.table.insert('', tk.END, text=stage, values=[
+                stats['count'] if column == 'count' else f"{stats[column]:.2f}"
+                for column in self.COLUMNS
+            ])
+
+        memory = snapshot.get('memory')
+        self.memory_label.config(text=(
+            f"Mémoire (tracemalloc) : {memory['current_bytes'] / 2**20:.1f} Mo, pic {memory['peak_bytes'] / 2**20:.1f} Mo"
+            if memory else "Mémoire non suivie"
+        ))
+        self.memory_button.config(
+            text="Arrêter le suivi mémoire" if tracemalloc.is_tracing() else "Suivre la mémoire"
+        )
+
+    def reset(self):
+        perf.reset()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self.refresh()
+
+    def toggle_memory(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        else:
+            tracemalloc.start()
+        self.refresh()
+
+    def export(self):
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension='.json',
+            filetypes=(("JSON", "*.json"), ("All files", "*.*"))
+        )
+        if file_path:
+            perf.dump(file_path)
+
+class HistoryView:
+    """Treeview virtualisé : seules les lignes visibles existent, l'historique reste dans le moteur."""
+
+    def __init__(
+        self,
+        tree: ttk.Treeview,
+        scrollbar: ttk.Scrollbar,
+        entries: Callable[[], Sequence[Dict[str, Any]]]
+    ):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.entries = entries
+        self.offset = 0  # nombre de lancers plus récents que la première ligne affichée
+        self.rows: List[str] = []
+
+        self.scrollbar.config(command=self.yview)
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(3))
+
+    def on_resize(self, event):
+        rowheight = int(ttk.Style().lookup('Treeview', 'rowheight') or HISTORY_ROW_HEIGHT)
+        count = max(1, event.height // rowheight - 1)  # une ligne pour les en-têtes
+        while len(self.rows) < count:
+            self.rows.append(self.tree.insert('', tk.END))
+        while len(self.rows) > count:
+            self.tree.delete(self.rows.pop())
+        self.refresh()
+
+    def on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.entries()))
+        elif args[0] == 'scroll':
+            step = len(self.rows) if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * step
+        self.refresh()
+
+    def scroll(self, rows: int):
+        self.offset += rows
+        self.refresh()
+
+    def add(self, count: int = 1):
+        # Garder les mêmes lancers à l'écran si l'utilisateur a fait défiler
+        if self.offset:
+            self.offset += count
+        self.refresh()
+
+    def refresh(self):
+        entries = self.entries()
+        total = len(entries)
+        self.offset = max(0, min(self.offset, total - len(self.rows)))
+
+        for position, item in enumerate(self.rows):
+            index = total - 1 - self.offset - position
+            if index < 0:
+                self.tree.detach(item)
+                continue
+            entry = entries[index]
+            self.tree.move(item, '', position)
+            self.tree.item(item, values=(
+                entry['talent'],
+                str(entry['result']),
+                entry['details'],
+                entry['time']
+            ))
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(self.rows)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+class RollEngine:
+    """Cœur sans interface : chargement des fiches, talents, lancers et historique."""
+
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        sheet_cache: Optional[SheetCache] = None,
+        roll_log: Optional[RollLog] = None,
+        dice_stream: str = ''
+    ):
+        self.config = config or Config()
+        # dice_stream : un flux de dés par moteur quand plusieurs partagent la graine (serveur)
+        self.dice_stream = dice_stream
+        self.dice = make_dice(self.config.data['rng_backend'], self.config.data['rng_seed'], dice_stream)
+        self.talent_cache = TalentCache()
+        self.sheet_cache = sheet_cache or SheetCache.for_config(self.config)
+        self.roll_log = roll_log
+        self.current_file: Optional[str] = None
+        self.sheet_watcher: Optional[SheetWatcher] = None
+        self.characters: Dict[str, Tuple[str, TalentCache]] = {}  # personnage -> (fiche, talents)
+        # deque bornée : l'éviction du plus ancien lancer est en O(1)
+        self.roll_history: deque = deque(maxlen=self.config.data['max_history_size'])
+        self.roll_count = 0
+        self.last_rolled: Dict[str, int] = {}
+
+    @staticmethod
+    def read_file(
+        file_path: str,
+        config_data: Dict[str, Any],
+        config_talents: Sequence[TalentRow],
+        sheet_cache: SheetCache,
+        progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> Tuple[TalentCache, Optional[SheetWatcher]]:
+        # Sans effet sur le moteur : peut tourner dans un thread
+        start_time = time.perf_counter()
+        if is_native_sheet(file_path):
+            # Fiche native : déjà prête, ni cache disque ni suivi des feuilles
+            talent_cache = RollEngine.read_native_file(file_path, config_data)
+            sheet_cache.remember_last_file(file_path)
+            talent_cache.search_index
+            perf.record('load_file', time.perf_counter() - start_time)
+            return talent_cache, None
+        watcher = SheetWatcher(file_path, config_data, config_talents)
+        talent_cache = sheet_cache.get(file_path, config_data)
+        if talent_cache is None:
+            watcher.talent_rows = read_talent_rows(file_path, config_data, progress=progress)
+            talent_cache = build_talent_cache(watcher.talent_rows, config_data, config_talents)
+            try:
+                sheet_cache.put(file_path, config_data, talent_cache)
+            except OSError as e:
+                logger.warning("Cache non enregistré : %s", e)
+        else:
+            sheet_cache.remember_last_file(file_path)
+        talent_cache.search_index  # construit hors du thread de l'interface
+        perf.record('load_file', time.perf_counter() - start_time)
+        return talent_cache, watcher
+
+    def load_file(self, file_path: str, progress: Optional[Callable[[int, int, str], None]] = None):
+        talent_cache, watcher = self.read_file(
+            file_path, dict(self.config.data), self.config.config_talents, self.sheet_cache, progress
+        )
+        self.set_talent_cache(file_path, talent_cache, watcher)
+
+    @staticmethod
+    def read_native_file(file_path: str, config_data: Dict[str, Any]) -> TalentCache:
+        with perf.timer('native_read'):
+            talent_cache, metadata = read_native_sheet(file_path)
+        if metadata.get('config') != config_fingerprint(config_data):
+            logger.warning("%s a été exporté avec une autre configuration des zones", os.path.basename(file_path))
+        source_path = native_sheet_source(file_path, metadata)
+        if source_path:
+            logger.warning(
+                "%s a été modifiée depuis l'export de %s : convertir de nouveau la fiche",
+                os.path.basename(source_path), os.path.basename(file_path)
+            )
+        return talent_cache
+
+    def load_cached_file(self, file_path: str) -> bool:
+        if is_native_sheet(file_path):
+            self.set_talent_cache(file_path, self.read_native_file(file_path, self.config.data))
+            return True
+        talent_cache = self.sheet_cache.get(file_path, self.config.data)
+        if talent_cache is None:
+            return False
+        watcher = SheetWatcher(file_path, self.config.data, self.config.config_talents)
+        self.set_talent_cache(file_path, talent_cache, watcher)
+        return True
+
+    def set_talent_cache(
+        self,
+        file_path: str,
+        talent_cache: TalentCache,
+        watcher: Optional[SheetWatcher] = None
+    ):
+        self.talent_cache = talent_cache
+        self.current_file = file_path
+        self.sheet_watcher = watcher
+        self.characters[character_name(file_path)] = (file_path, talent_cache)
+
+    @staticmethod
+    def read_folder(
+        folder: str,
+        config_data: Dict[str, Any],
+        config_talents: Sequence[TalentRow],
+        sheet_cache: SheetCache,
+        progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> Tuple[Dict[str, TalentCache], Dict[str, Exception]]:
+        talent_caches, errors = load_workbooks(
+            character_sheet_files(folder),
+            config_data,
+            config_talents,
+            sheet_cache,
+            progress=progress
+        )
+        for talent_cache in talent_caches.values():
+            talent_cache.search_index
+        return talent_caches, errors
+
+    def add_characters(self, talent_caches: Dict[str, TalentCache]):
+        for file_path, talent_cache in talent_caches.items():
+            self.characters[character_name(file_path)] = (file_path, talent_cache)
+
+    def select_character(self, character: str):
+        file_path, talent_cache = self.characters[character]
+        watcher = None
+        if not is_native_sheet(file_path):  # fiche native : pas de suivi, comme dans read_file
+            try:
+                watcher = SheetWatcher(file_path, self.config.data, self.config.config_talents)
+            except OSError:  # fiche déplacée depuis le chargement
+                pass
+        self.set_talent_cache(file_path, talent_cache, watcher)
+
+    def roll(self, talent: str, karma_dice: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Lance les dés du talent ; karma_dice n'est utilisé que pour les talents à karma."""
+        talent_data = self.talent_cache.get_talent(talent)
+        if not talent_data:
+            return None
+
+        karma_faces = int(karma_dice[1:]) if karma_dice and talent_data.karma else None
+        start_time = time.perf_counter()
+        result = talent_data.expression.roll_detailed(karma_faces, self.dice)
+        perf.record('roll', time.perf_counter() - start_time)
+        if self.roll_log is not None:
+            self.roll_log.append(talent, result)
+        return self.add_to_history(talent, result.total, result.details)
+
+    def add_to_history(self, talent: str, result: int, details: str) -> Dict[str, Any]:
+        from datetime import datetime
+
+        # Utilisé pour classer la recherche approchée
+        self.roll_count += 1
+        self.last_rolled[talent] = self.roll_count
+
+        entry = {
+            'talent': talent,
+            'result': result,
+            'details': details,
+            'time': datetime.now().strftime('%H:%M:%S')
         }
+        self.roll_history.append(entry)
+        return entry
+
+    def set_config(self, config: Config):
+        if (config.data['rng_backend'], config.data['rng_seed']) != (
+            self.config.data['rng_backend'], self.config.data['rng_seed']
+        ):
+            self.dice = make_dice(config.data['rng_backend'], config.data['rng_seed'], self.dice_stream)
+        self.config = config
+        if self.roll_history.maxlen != config.data['max_history_size']:
+            self.roll_history = deque(self.roll_history, maxlen=config.data['max_history_size'])
+
+    def search(self, text: str) -> List[str]:
+        with perf.timer('search'):
+            return self.talent_cache.search_index.search(text, self.last_rolled, self.roll_count)
+
+    def success_probability(
+        self,
+        talent: str,
+        target: int,
+        karma_dice: Optional[str] = None
+    ) -> Optional[float]:
+        talent_data = self.talent_cache.get_talent(talent)
+        if not talent_data:
+            return None
+
+        karma_faces = int(karma_dice[1:]) if karma_dice else None
+        distribution = dice_distribution(
+            talent_data.expression,
+            karma_faces,
+            self.config.data['probability_epsilon']
+        )
+        return distribution.prob_at_least(target)
+
+class RollServer:
+    """Serveur local partagé par la table : une fiche chargée une seule fois par personnage.
+
+    Protocole : une ligne JSON par message sur TCP.
+    {"character": "...", "talent": "...", "karma": true | "D8"} -> lancer diffusé à tous les clients
+    {"load": "fiche.xlsx", "character": "..."} -> (re)chargement dans un exécuteur
+    """
+
+    def __init__(self, config: Optional[Config] = None, host: str = SERVER_HOST, port: int = SERVER_PORT):
+        self.config = config or Config()
+        self.sheet_cache = SheetCache.for_config(self.config)
+        self.roll_log = RollLog.for_config(self.config)
+        self.host = host
+        self.port = port
+        self.engines: Dict[str, RollEngine] = {}
+        self.clients: set = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def load(self, file_path: str, character: Optional[str] = None) -> str:
+        # La lecture Excel ne bloque pas la boucle : les lancers continuent pendant ce temps
+        character = character or character_name(file_path)
+        loop = asyncio.get_running_loop()
+        talent_cache, watcher = await loop.run_in_executor(
+            None,
+            RollEngine.read_file,
+            file_path,
+            dict(self.config.data),
+            self.config.config_talents,
+            self.sheet_cache
+        )
+        engine = self.engines.get(character) or RollEngine(
+            self.config, self.sheet_cache, self.roll_log, dice_stream=character
+        )
+        engine.set_talent_cache(file_path, talent_cache, watcher)
+        self.engines[character] = engine
+        return character
+
+    def roll(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        character = request.get('character')
+        talent = request.get('talent', '')
+        karma = request.get('karma')
+        if not isinstance(character, str) or not isinstance(talent, str):
+            return {'error': "Requête invalide : character et talent doivent être des chaînes"}
+        # isinstance plutôt que `in (True, False)` : 1, 0 et 1.0 sont refusés
+        karma_valid = karma is None or isinstance(karma, bool) or (
+            isinstance(karma, str) and KARMA_DIE_PATTERN.fullmatch(karma) is not None
+        )
+        if not karma_valid:
+            return {'error': f"Requête invalide : karma doit valoir true ou un dé comme D8, pas {karma!r}"}
+
+        engine = self.engines.get(character)
+        if engine is None:
+            return {'error': f"Personnage inconnu : {character}"}
+
+        if karma is True:
+            karma = self.config.data['default_karma_die']
+        entry = engine.roll(talent, karma or None)
+        if entry is None:
+            return {'error': "Talent non trouvé dans le fichier.", 'character': character}
+        return {'character': character, **entry}
+
+    async def handle_request(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Renvoie la réponse et si elle doit être diffusée à toute la table."""
+        if 'load' in request:
+            if not isinstance(request['load'], str) or not isinstance(request.get('character', ''), (str, type(None))):
+                return {'error': "Requête invalide : load et character doivent être des chaînes"}, False
+            try:
+                character = await self.load(request['load'], request.get('character'))
+            except Exception as e:
+                return {'error': f"Erreur lors du chargement: {e}"}, False
+            return {'loaded': character}, True
+
+        response = self.roll(request)
+        return response, 'error' not in response
+
+    async def send(self, writer: asyncio.StreamWriter, message: Dict[str, Any]):
+        writer.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+        try:
+            await writer.drain()
+        except ConnectionError:
+            self.clients.discard(writer)
+
+    async def broadcast(self, message: Dict[str, Any]):
+        await asyncio.gather(*(self.send(writer, message) for writer in list(self.clients)))
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.clients.add(writer)
+        await self.send(writer, {'characters': sorted(self.engines)})
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("objet JSON attendu")
+                except ValueError as e:
+                    await self.send(writer, {'error': f"Requête invalide : {e}"})
+                    continue
+
+                try:
+                    response, shared = await self.handle_request(request)
+                except Exception as e:
+                    # Une requête imprévue ne doit pas couper la connexion du joueur
+                    logger.exception("Requête en erreur : %r", request)
+                    response, shared = {'error': f"Erreur : {e}"}, False
+                if shared:
+                    await self.broadcast(response)
+                else:
+                    await self.send(writer, response)
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def start(self, file_paths: List[str] = ()):
+        # Chargement initial réparti sur plusieurs processus
+        loop = asyncio.get_running_loop()
+        talent_caches, errors = await loop.run_in_executor(
+            None,
+            load_workbooks,
+            list(file_paths),
+            dict(self.config.data),
+            self.config.config_talents,
+            self.sheet_cache
+        )
+        for file_path, talent_cache in talent_caches.items():
+            character = character_name(file_path)
+            engine = RollEngine(self.config, self.sheet_cache, self.roll_log, dice_stream=character)
+            watcher = None
+            if not is_native_sheet(file_path):
+                watcher = SheetWatcher(file_path, self.config.data, self.config.config_talents)
+            engine.set_talent_cache(file_path, talent_cache, watcher)
+            self.engines[character] = engine
+        for path, error in errors.items():
+            logger.error("Erreur lors du chargement de %s : %s", path, error)
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self, file_paths: List[str] = ()):
+        await self.start(file_paths)
+        print(f"Serveur de lancers sur {self.host}:{self.port} ({', '.join(sorted(self.engines))})", file=sys.stderr)
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.roll_log.close()
 
 class DiceRollerApp:
     def __init__(self):
         self.root = tk.Tk()
-        self.config = Config()
-        self.talent_cache = TalentCache()
-        self.roll_history: List[Dict[str, Any]] = []
+        config = Config()
+        self.engine = RollEngine(config, roll_log=RollLog.for_config(config))
+        self.watch_job: Optional[str] = None
+        self.loading = False
+        self.permanent_buttons: Dict[Tuple[int, int], ttk.Button] = {}
+        self.spare_buttons: List[ttk.Button] = []  # boutons masqués, réutilisés avant d'en créer
+        # Modifications de l'interface en attente, appliquées ensemble par redraw
+        self.pending_redraw: Dict[str, Any] = {}
+        self.redraw_job: Optional[str] = None
         
         self.setup_window()
         self.setup_ui()
         self.add_tooltips()
 
+        # Réouverture de la dernière fiche depuis le cache disque
+        self.root.after(0, self.reopen_last_file)
+
+        # Préchargement de numpy (index de recherche) une fois la fenêtre affichée
+        self.root.after(WARMUP_DELAY_MS, self.start_warmup)
+
+    def start_warmup(self):
+        threading.Thread(target=warm_up_numpy, daemon=True).start()
+
+    def report_startup_time(self):
+        print(json.dumps({'first_mainloop_s': time.perf_counter() - START_TIME}), flush=True)
+        self.root.destroy()
+
     def setup_window(self):
         self.root.title('Lanceur de dés amélioré')
-        self.root.geometry(self.config.data['window_size'])
+        self.root.geometry(self.engine.config.data['window_size'])
 
     def on_return(self, event):
         self.lancer_des()
@@ -199,6 +2691,41 @@ class DiceRollerApp:
         )
         self.open_file_button.pack(side=tk.TOP, pady=10)
 
+        self.open_folder_button = ttk.Button(
+            file_frame,
+            text="Ouvrir un dossier de fiches",
+            command=self.load_folder
+        )
+        self.open_folder_button.pack(side=tk.TOP)
+
+        self.export_button = ttk.Button(
+            file_frame,
+            text="Exporter la fiche (format rapide)",
+            command=self.export_native_sheet
+        )
+        self.export_button.pack(side=tk.TOP, pady=5)
+
+        self.current_file_label = ttk.Label(file_frame)
+        self.current_file_label.pack(side=tk.TOP)
+
+        # Personnage actif parmi les fiches chargées
+        self.character_combo = ttk.Combobox(file_frame, state='readonly')
+        self.character_combo.pack(side=tk.TOP, pady=5)
+        self.character_combo.bind('<<ComboboxSelected>>', self.on_character_selected)
+
+        self.watch_var = tk.BooleanVar(value=False)
+        self.watch_checkbutton = ttk.Checkbutton(
+            file_frame,
+            text="Suivre les modifications de la fiche",
+            variable=self.watch_var,
+            command=self.toggle_watch
+        )
+        self.watch_checkbutton.pack(side=tk.TOP)
+
+        # Progression du chargement, affichée uniquement pendant la lecture
+        self.load_progress = ttk.Progressbar(file_frame, mode='determinate')
+        self.load_status_label = ttk.Label(file_frame)
+
         # Bouton pour sauvegarder la configuration
         #self.save_config_button = ttk.Button(
         #    file_frame,
@@ -224,7 +2751,7 @@ class DiceRollerApp:
             values=["D8", "D10", "D12"], 
             state='readonly'
         )
-        self.karma_combo.set(self.config.data['default_karma_die'])
+        self.karma_combo.set(self.engine.config.data['default_karma_die'])
         self.karma_combo.pack(pady=5, padx=5, fill=tk.X)
 
         # Frame pour les boutons permanents
@@ -238,6 +2765,8 @@ class DiceRollerApp:
         self.talent_combo = AutocompleteCombobox(self.main_frame)
         self.talent_combo.pack(pady=10, fill=tk.X)
         self.talent_combo.bind('<Return>', self.on_return)
+        self.root.bind('<Control-P>', lambda event: PerformanceWindow(self.root))
+        self.talent_combo.fuzzy_search = self.search_talents
 
         # Labels de résultat
         self.result_frame = ttk.LabelFrame(self.main_frame, text="Résultat")
@@ -257,6 +2786,21 @@ class DiceRollerApp:
         )
         self.result_value_label.pack(pady=5)
 
+        # Probabilité de réussite contre un seuil de difficulté
+        target_frame = ttk.Frame(self.result_frame)
+        target_frame.pack(pady=5)
+
+        ttk.Label(target_frame, text="Difficulté :").pack(side=tk.LEFT)
+        self.target_var = tk.StringVar()
+        self.target_entry = ttk.Entry(target_frame, width=5, textvariable=self.target_var)
+        self.target_entry.pack(side=tk.LEFT, padx=5)
+        self.odds_label = ttk.Label(target_frame)
+        self.odds_label.pack(side=tk.LEFT)
+
+        self.target_var.trace_add('write', lambda *args: self.update_odds())
+        self.talent_combo.bind('<<ComboboxSelected>>', lambda event: self.update_odds())
+        self.karma_combo.bind('<<ComboboxSelected>>', lambda event: self.update_odds())
+
         self.details_label = ttk.Label(
             self.result_frame, 
             wraplength=450, 
@@ -272,6 +2816,13 @@ class DiceRollerApp:
         )
         self.launch_button.pack(pady=10, fill=tk.X)
 
+        self.simulation_button = ttk.Button(
+            self.main_frame,
+            text="Simulation",
+            command=self.open_simulation
+        )
+        self.simulation_button.pack(fill=tk.X)
+
         # Historique des lancers
         self.history_frame = ttk.LabelFrame(
             self.main_frame, 
@@ -298,13 +2849,16 @@ class DiceRollerApp:
         self.history_tree.column('Détails', width=250)
         self.history_tree.column('Heure', width=50)
         
-        # Ajout de la scrollbar
+        # Ajout de la scrollbar, pilotée par la vue virtualisée
         history_scrollbar = ttk.Scrollbar(
             self.history_frame,
-            orient=tk.VERTICAL,
-            command=self.history_tree.yview
+            orient=tk.VERTICAL
+        )
+        self.history_view = HistoryView(
+            self.history_tree,
+            history_scrollbar,
+            lambda: self.engine.roll_history
         )
-        self.history_tree.configure(yscrollcommand=history_scrollbar.set)
         
         # Placement du treeview et de la scrollbar
         self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -314,317 +2868,347 @@ class DiceRollerApp:
         tooltips = {
             self.karma_combo: "Sélectionnez le type de dé de karma à utiliser",
             self.talent_combo: "Entrez ou sélectionnez un talent",
+            self.target_entry: "Seuil de difficulté pour calculer les chances de réussite",
             self.launch_button: "Cliquez pour lancer les dés du talent sélectionné",            
             #self.save_config_button: "Sauvegarder la configuration actuelle",
-            self.open_file_button: "Ouvrir un fichier Excel contenant les talents"
+            self.open_file_button: "Ouvrir un fichier Excel contenant les talents",
+            self.open_folder_button: "Charger toutes les fiches d'un dossier (groupe, bestiaire)",
+            self.export_button: "Enregistrer les talents de la fiche ouverte dans un fichier .edsheet qui s'ouvre instantanément",
+            self.character_combo: "Personnage actif",
+            self.watch_checkbutton: "Recharger automatiquement les feuilles modifiées de la fiche ouverte"
         }
         
         for widget, text in tooltips.items():
             ToolTip(widget, text)
 
     def load_excel_file(self):
-        try:
-            file_path = filedialog.askopenfilename(
-                filetypes=(
-                    ("Excel files", "*.xlsx *.xls *.xlsm"),
-                    ("All files", "*.*")
-                )
+        file_path = filedialog.askopenfilename(
+            filetypes=(
+                ("Fiches", f"*.xlsx *.xls *.xlsm *{NATIVE_SHEET_EXTENSION}"),
+                ("Excel files", "*.xlsx *.xls *.xlsm"),
+                ("All files", "*.*")
             )
-            
-            if not file_path:
-                return
-
-            xls = pd.ExcelFile(file_path)
-            self.talent_cache = TalentCache()  # Reset cache
+        )
 
-            for sheet_name, zones in self.config.data['excel_zones'].items():
-                if sheet_name not in xls.sheet_names:
-                    continue
+        if file_path:
+            self.start_loading(file_path)
 
-                for zone in zones:
-                    start, end = zone
-                    df = pd.read_excel(
-                        xls,
-                        sheet_name,
-                        skiprows=start-1,
-                        nrows=end-start+1,
-                        usecols="B:Q"
-                    )
+    def export_native_sheet(self):
+        source_path = self.engine.current_file
+        if not source_path or is_native_sheet(source_path):
+            messagebox.showinfo("Export", "Ouvrir d'abord une fiche Excel.")
+            return
 
-                    # Nettoyer les noms de colonnes
-                    df.columns = [
-                        'Talents' if isinstance(col, str) and col.strip() in self.config.data['substitute_talent_column_name'] else col.strip() if isinstance(col, str) else col 
-                        for col in df.columns
-                    ]
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=NATIVE_SHEET_EXTENSION,
+            initialdir=os.path.dirname(source_path),
+            initialfile=character_name(source_path) + NATIVE_SHEET_EXTENSION,
+            filetypes=(("Fiche native", f"*{NATIVE_SHEET_EXTENSION}"), ("All files", "*.*"))
+        )
+        if not file_path:
+            return
+        try:
+            export_native_sheet(source_path, self.engine.talent_cache, self.engine.config.data, file_path)
+        except OSError as e:
+            messagebox.showerror("Erreur", f"Export impossible : {e}")
+            return
+        messagebox.showinfo("Succès", f"Fiche exportée : {os.path.basename(file_path)}")
 
-                    if not all(col in df.columns for col in self.config.data['required_columns']):
-#                    if not all(col in df.columns for col in REQUIRED_COLUMNS):
-                        print(f"Colonnes manquantes dans {sheet_name}")
-                        continue
+    def reopen_last_file(self):
+        file_path = self.engine.sheet_cache.last_file
+        if not file_path or not os.path.exists(file_path):
+            return
 
-                    self.process_talent_data(df)
+        if self.engine.load_cached_file(file_path):
+            # Index de recherche construit hors du thread de l'interface, avant la première frappe
+            talent_cache = self.engine.talent_cache
+            threading.Thread(target=lambda: talent_cache.search_index, daemon=True).start()
+            self.show_talent_cache()
+        else:
+            self.start_loading(file_path, notify=False)
+
+    def load_folder(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            self.start_loading(folder, folder=True)
+
+    def start_loading(self, file_path: str, notify: bool = True, folder: bool = False):
+        # Lecture et ingestion dans un thread ; l'interface suit via une file
+        self.loading = True
+        self.open_file_button.config(state=tk.DISABLED)
+        self.open_folder_button.config(state=tk.DISABLED)
+        self.load_progress.config(value=0)
+        self.load_progress.pack(side=tk.TOP, fill=tk.X, padx=5)
+        self.load_status_label.config(text="Chargement...")
+        self.load_status_label.pack(side=tk.TOP)
+
+        load_queue: queue.Queue = queue.Queue()
+        worker = threading.Thread(
+            target=self.folder_worker if folder else self.load_worker,
+            args=(
+                file_path,
+                dict(self.engine.config.data),
+                self.engine.config.config_talents,
+                self.engine.sheet_cache,
+                load_queue
+            ),
+            daemon=True
+        )
+        worker.start()
+        self.root.after(LOAD_POLL_MS, self.poll_load_queue, load_queue, notify)
 
-            self.update_talent_list()
-            self.create_permanent_buttons()
-            messagebox.showinfo("Succès", "Fichier Excel chargé avec succès!")
-            
-            # Close the Excel file
-            xls.close()
+    @staticmethod
+    def folder_worker(
+        folder: str,
+        config_data: Dict[str, Any],
+        config_talents: Sequence[TalentRow],
+        sheet_cache: SheetCache,
+        load_queue: queue.Queue
+    ):
+        try:
+            talent_caches, errors = RollEngine.read_folder(
+                folder,
+                config_data,
+                config_talents,
+                sheet_cache,
+                progress=lambda done, total, file_name: load_queue.put(('progress', done, total, file_name))
+            )
+            load_queue.put(('folder', talent_caches, errors))
+        except Exception as e:
+            load_queue.put(('error', e))
 
+    @staticmethod
+    def load_worker(
+        file_path: str,
+        config_data: Dict[str, Any],
+        config_talents: Sequence[TalentRow],
+        sheet_cache: SheetCache,
+        load_queue: queue.Queue
+    ):
+        try:
+            talent_cache, watcher = RollEngine.read_file(
+                file_path,
+                config_data,
+                config_talents,
+                sheet_cache,
+                progress=lambda done, total, sheet_name: load_queue.put(('progress', done, total, sheet_name))
+            )
+            load_queue.put(('done', file_path, talent_cache, watcher))
         except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors du chargement: {str(e)}")
+            load_queue.put(('error', e))
+
+    def poll_load_queue(self, load_queue: queue.Queue, notify: bool = True):
+        while True:
+            try:
+                message = load_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(LOAD_POLL_MS, self.poll_load_queue, load_queue, notify)
+                return
 
-    def validate_talent_data(
-        self,
-        talent: Any,
-        niv_tot: Any,
-        des: Any,
-        classification: Any
-    ) -> bool:
-        if pd.isna(talent) or pd.isna(niv_tot) or not isinstance(niv_tot, (int, float)):
-            return False
-        if pd.isna(des) or not isinstance(des, str):
-            return False
-        if not re.match(r'^(\d*D\d+\s*[\+\-]?\s*)*\d*$', str(des).strip()):
-            return False
-        return True
+            kind = message[0]
+            if kind == 'progress':
+                _, done, total, sheet_name = message
+                self.load_progress.config(maximum=total, value=done)
+                self.load_status_label.config(text=f"Chargement : {sheet_name} ({done}/{total})")
+                continue
 
-    def update_talent_list(self):
-        talents = self.talent_cache.get_all_talents()
-        self.talent_combo.set_completion_list(talents)
-
-    def create_permanent_buttons(self):  #sans doute jamais utilisé
-        for widget in self.permanent_buttons_frame.winfo_children():
-            widget.destroy()
-
-        talents_with_classification = self.talent_cache.get_classified_talents()
-        talents_with_classification.sort(key=lambda x: (x[1], x[0]))
-
-        columns = {i: [] for i in range(1, 5)}
-        for talent, classification in talents_with_classification:
-            print(talent, " : ", classification)
-            if classification <= 4:
-                columns[classification].append(talent)
-
-        for col in columns.values():
-            col[:] = col[:5]
-
-        for col_num, talents in columns.items():
-            for row_num, talent in enumerate(talents):
-                button = ttk.Button(
-                    self.permanent_buttons_frame,
-                    text=talent,
-                    command=lambda t=talent: self.lancer_des_for_talent(t)
-                )
-                button.grid(row=row_num, column=col_num-1, pady=5, padx=10, sticky=tk.W+tk.E)
+            self.finish_loading()
+            if kind == 'error':
+                messagebox.showerror("Erreur", f"Erreur lors du chargement: {str(message[1])}")
+                return
 
-    def roll_dice(self, des: str, add_karma: bool = False, karma_dice: Optional[str] = None) -> Tuple[int, str]:
-        def roll_single_die(faces: int) -> Tuple[int, List[str]]:
-            total = 0
-            rolls = []
-            current_roll = random.randint(1, faces)
-            total += current_roll
-            rolls.append(f"{current_roll} (D{faces})")
-            
-            while current_roll == faces:  # Explosion
-                current_roll = random.randint(1, faces)
-                total += current_roll
-                rolls.append(f"EXP {current_roll} (D{faces})")
-                
-            return total, rolls
-
-        total_result = 0
-        all_rolls = []
-        
-        # Parse and roll dice
-        for match in re.finditer(r"(\d*)D(\d+)", des):
-            count = int(match.group(1)) if match.group(1) else 1
-            faces = int(match.group(2))
-            
-            for _ in range(count):
-                result, rolls = roll_single_die(faces)
-                total_result += result
-                all_rolls.extend(rolls)
-
-        # Add any fixed modifiers
-        modifier_match = re.search(r'[\+\-]\s*\d+$', des)
-        if modifier_match:
-            modifier = int(modifier_match.group())
-            total_result += modifier
-            all_rolls.append(str(modifier))
-        
-        # Handle karma dice
-        if add_karma and karma_dice:
-            karma_faces = int(karma_dice[1:])
-            karma_result, karma_rolls = roll_single_die(karma_faces)
-            total_result += karma_result
-            all_rolls.extend([f"KARMA {roll}" for roll in karma_rolls])
-        
-        return total_result, " + ".join(all_rolls)
+            if kind == 'folder':
+                _, talent_caches, errors = message
+                self.set_characters(talent_caches, errors)
+                return
 
-    def lancer_des(self):
-        talent = self.talent_combo.get()
-        talent_data = self.talent_cache.get_talent(talent)
-        
-        if not talent_data:
-            messagebox.showerror("Erreur", "Talent non trouvé dans le fichier.")
+            _, file_path, talent_cache, watcher = message
+            self.set_talent_cache(file_path, talent_cache, watcher)
+            if notify:
+                messagebox.showinfo("Succès", "Fichier Excel chargé avec succès!")
             return
 
-        des = talent_data['des']
-        karma = talent_data['karma']
-        karma_dice = self.karma_combo.get() if karma else None
-
-        if karma:
-            add_karma = messagebox.askyesno(
-                "Ajouter un dé de karma",
-                f"Ajouter un dé de karma ({karma_dice}) ?"
-            )
+    def set_talent_cache(
+        self,
+        file_path: str,
+        talent_cache: TalentCache,
+        watcher: Optional[SheetWatcher] = None
+    ):
+        # Le nouveau cache ne remplace l'ancien qu'une fois complet
+        self.engine.set_talent_cache(file_path, talent_cache, watcher)
+        self.show_talent_cache()
+
+    def set_characters(self, talent_caches: Dict[str, TalentCache], errors: Dict[str, Exception]):
+        self.engine.add_characters(talent_caches)
+        if talent_caches:
+            self.engine.select_character(character_name(next(iter(talent_caches))))
+            self.show_talent_cache()
+        if errors:
+            messagebox.showerror("Erreur", "Fiches non chargées :\n" + "\n".join(
+                f"{os.path.basename(path)} : {error}" for path, error in errors.items()
+            ))
         else:
-            add_karma = False
-
-        result, details = self.roll_dice(des, add_karma, karma_dice)
-        
-        # Mise à jour des labels
-        self.result_label.config(
-            text=f'Résultat pour le talent "{talent}" '
-                 f'(Niv. Tot. {int(talent_data["niv_tot"])}/{des}):'
+            messagebox.showinfo("Succès", f"{len(talent_caches)} fiches chargées avec succès!")
+
+    def on_character_selected(self, event):
+        self.engine.select_character(self.character_combo.get())
+        self.request_redraw(talents=True, odds=True)
+
+    def show_talent_cache(self):
+        self.request_redraw(talents=True)
+
+    def request_redraw(self, **parts: Any):
+        """Regroupe les modifications d'un lancer ou d'un chargement en un seul rafraîchissement.
+
+        parts : talents, buttons, odds (True), result (trois textes), history (lancers ajoutés).
+        """
+        if 'history' in parts:
+            parts['history'] += self.pending_redraw.get('history', 0)
+        self.pending_redraw.update(parts)
+        if self.redraw_job is None:
+            self.redraw_job = self.root.after_idle(self.redraw)
+
+    def redraw(self):
+        self.redraw_job = None
+        parts, self.pending_redraw = self.pending_redraw, {}
+        with perf.timer('redraw'):
+            if parts.get('talents'):
+                self.character_combo.config(values=sorted(self.engine.characters))
+                self.character_combo.set(character_name(self.engine.current_file))
+                self.current_file_label.config(text=os.path.basename(self.engine.current_file))
+                self.update_talent_list()
+            if parts.get('talents') or parts.get('buttons'):
+                with perf.timer('widgets'):
+                    self.create_permanent_buttons()
+            if 'result' in parts:
+                self.update_result_labels(*parts['result'])
+            if parts.get('history'):
+                self.history_view.add(parts['history'])
+            if parts.get('odds'):
+                self.update_odds()
+
+    def finish_loading(self):
+        self.loading = False
+        self.load_progress.pack_forget()
+        self.load_status_label.pack_forget()
+        self.open_file_button.config(state=tk.NORMAL)
+        self.open_folder_button.config(state=tk.NORMAL)
+
+    def add_to_history(self, entry: Dict[str, Any]):
+        # Le moteur a déjà ajouté le lancer : seules les lignes visibles sont mises à jour
+        self.request_redraw(history=1)
+
+    def search_talents(self, text: str) -> List[str]:
+        return self.engine.search(text)
+
+    def toggle_watch(self):
+        if self.watch_job is not None:
+            self.root.after_cancel(self.watch_job)
+            self.watch_job = None
+        if self.watch_var.get():
+            self.watch_job = self.root.after(self.engine.config.data['watch_interval_ms'], self.poll_watched_file)
+
+    def poll_watched_file(self):
+        # Simple comparaison de date : la relecture n'a lieu que si la fiche a changé
+        if self.engine.sheet_watcher and not self.loading and self.engine.sheet_watcher.has_changed():
+            self.start_refresh()
+        self.watch_job = self.root.after(self.engine.config.data['watch_interval_ms'], self.poll_watched_file)
+
+    def start_refresh(self):
+        self.loading = True
+        refresh_queue: queue.Queue = queue.Queue()
+        worker = threading.Thread(
+            target=self.refresh_worker,
+            args=(self.engine.sheet_watcher, self.engine.sheet_cache, refresh_queue),
+            daemon=True
         )
-        self.result_value_label.config(text=str(result))
-        self.details_label.config(text=f'Détails: {details}')
-        
-        # Ajout à l'historique
-        from datetime import datetime
-        self.add_to_history(talent, result, details, datetime.now().strftime("%H:%M:%S"))
-
-    def add_to_history(self, talent: str, result: int, details: str):
-            from datetime import datetime
-        
-            # Limiter la taille de l'historique
-            if len(self.roll_history) >= self.config.data['max_history_size']:
-                self.roll_history.pop(0)
-                # Supprimer la première entrée du Treeview
-                first_item = self.history_tree.get_children()[0]
-                self.history_tree.delete(first_item)
-        
-            # Ajouter le nouveau lancer à l'historique
-            current_time = datetime.now().strftime('%H:%M:%S')
-            self.roll_history.append({
-                'talent': talent,
-                'result': result,
-                'details': details,
-                'time': current_time
-            })
-        
-            # Ajouter l'entrée dans le Treeview
-            self.history_tree.insert('', 0, values=(
-                talent,
-                str(result),
-                details,
-                current_time
-             ))
-
-    def process_talent_data(self, df: pd.DataFrame):
-        for _, row in df.iterrows():
-            talent = row['Talents']
-            niv_tot = row['Niv. Tot.']
-            des = row['Dés']
-            classification = row['Classification']
-
-            if not self.validate_talent_data(talent, niv_tot, des, classification):
-                continue
+        worker.start()
+        self.root.after(LOAD_POLL_MS, self.poll_refresh_queue, refresh_queue)
 
-            talent = talent.strip()
-            karma = bool(re.search(r' \(D\)$', talent))
-            talent_key = re.sub(r' \(D\)$', '', talent)
+    @staticmethod
+    def refresh_worker(watcher: SheetWatcher, sheet_cache: SheetCache, refresh_queue: queue.Queue):
+        try:
+            talent_cache, sheets = watcher.refresh()
+            talent_cache.search_index
+        except Exception as e:
+            # Fiche en cours d'enregistrement par Excel : nouvel essai au prochain passage
+            logger.info("Relecture impossible : %s", e)
+            refresh_queue.put(None)
+            return
 
-            if not karma and f"{talent_key} (D)" in self.talent_cache._cache:
-                continue
+        try:
+            sheet_cache.put(watcher.file_path, watcher.config_data, talent_cache)
+        except OSError as e:
+            logger.warning("Cache non enregistré : %s", e)
+        refresh_queue.put((watcher, talent_cache, sheets))
 
-            if pd.notna(des) and str(des).strip():
-                des = des.strip()
-                if classification > 0:
-                    print("adding regular talent")
-                    print(talent)
-                    print(float(niv_tot))
-                    print(des)
-                    print(karma)
-                    print(classification)
-                self.talent_cache.add_talent(
-                    talent,
-                    float(niv_tot),
-                    des,
-                    karma,
-                    classification
-                )
+    def poll_refresh_queue(self, refresh_queue: queue.Queue):
+        try:
+            result = refresh_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, self.poll_refresh_queue, refresh_queue)
+            return
 
-        # Add damage buttons from config
-        if 'damage_buttons' in self.config.data:
-            print("Adding damage buttons")
-            for button_name, button_data in self.config.data['damage_buttons'].items():
-                print(f"Adding button: {button_name}")
-                print(button_data['Talents'])
-                print(float(button_data['Niv. Tot.']))
-                print(button_data['Dés'])
-                print(bool(re.search(r' \(D\)$', button_data['Talents'])))
-                print(float(button_data['Classification']))
-                self.talent_cache.add_talent(
-                    button_data['Talents'],
-                    float(button_data['Niv. Tot.']),
-                    button_data['Dés'],
-                    bool(re.search(r' \(D\)$', button_data['Talents'])),
-                    float(button_data['Classification'])
-                )
+        self.loading = False
+        if result is None or result[0] is not self.engine.sheet_watcher:
+            return
 
-    def validate_talent_data(self, talent, niv_tot, des, classification) -> bool:
-        if not pd.notna(talent) or not isinstance(talent, str):
-            return False
-        if not pd.notna(niv_tot) or not isinstance(niv_tot, (int, float)):
-            return False
-        if not pd.notna(des) or not isinstance(des, str):
-            return False
-        if not re.match(r'^(\d*D\d+\s*[\+\-]?\s*)*\d*$', des.strip()):
-            return False
-        return True
+        _, talent_cache, sheets = result
+        added, removed, changed = self.engine.talent_cache.diff(talent_cache)
+        self.engine.set_talent_cache(self.engine.current_file, talent_cache, self.engine.sheet_watcher)
+        self.talent_combo.update_completions(added, removed)
+        if added or removed or changed:
+            self.request_redraw(buttons=True, odds=True)
+        self.current_file_label.config(
+            text=f"{os.path.basename(self.engine.current_file)} (mis à jour : {', '.join(sheets)})"
+        )
 
     def update_talent_list(self):
-        self.talent_combo.set_completion_list(self.talent_cache.get_all_talents())
+        self.talent_combo.set_completion_list(self.engine.talent_cache.get_all_talents())
 
     def create_permanent_buttons(self):
-        print("Creating permanent buttons")
-        # Nettoyer les boutons existants
-        for widget in self.permanent_buttons_frame.winfo_children():
-            widget.destroy()
-
-        # Récupérer et trier les talents classifiés
-        talents_with_classification = self.talent_cache.get_classified_talents()
-        talents_with_classification.sort(key=lambda x: (-x[1], x[0]))
-
-        # Créer les colonnes de boutons
-        columns = {i: [] for i in range(1, 5)}
-        for talent, classification in talents_with_classification:
-            print(talent, " : ", classification)
-            if classification <= 4:
-                columns[int(classification)].append(talent)
-
-        # Limiter à 5 boutons par colonne
-        for col in columns.values():
-            col[:] = col[:5]
-
-        # Créer les boutons
-        for col_num, talents in columns.items():
-            for row_num, talent in enumerate(talents):
-                button = ttk.Button(
-                    self.permanent_buttons_frame,
-                    text=talent,
-                    command=lambda t=talent: self.lancer_des_for_talent(t)
-                )
+        logger.debug("Création des boutons permanents")
+        config_data = self.engine.config.data
+
+        # Colonnes de boutons, déjà triées par le cache des talents
+        columns = {
+            i: self.engine.talent_cache.get_classification_column(i)
+            for i in range(1, config_data['quick_button_columns'] + 1)
+        }
+
+        # Limiter le nombre de boutons par colonne
+        layout = {
+            (row_num, col_num - 1): talent
+            for col_num, talents in columns.items()
+            for row_num, talent in enumerate(talents[:config_data['quick_button_rows']])
+        }
+
+        # Les boutons sans talent sont masqués et gardés pour le prochain chargement
+        for position in list(self.permanent_buttons):
+            if position not in layout:
+                button = self.permanent_buttons.pop(position)
+                button.grid_remove()
+                self.spare_buttons.append(button)
+
+        # Seuls les boutons dont le talent change sont reconfigurés
+        for (row_num, col_num), talent in layout.items():
+            button = self.permanent_buttons.get((row_num, col_num))
+            if button is None:
+                button = self.spare_buttons.pop() if self.spare_buttons else ttk.Button(self.permanent_buttons_frame)
                 button.grid(
                     row=row_num,
-                    column=col_num-1,
+                    column=col_num,
                     pady=5,
                     padx=10,
                     sticky=tk.W+tk.E
                 )
+                self.permanent_buttons[(row_num, col_num)] = button
+            elif button.cget('text') == talent:
+                continue
+            button.config(text=talent, command=lambda t=talent: self.lancer_des_for_talent(t))
+
+    def open_simulation(self):
+        SimulationWindow(self)
 
     def lancer_des_for_talent(self, talent: str):
         self.talent_combo.set(talent)
@@ -632,17 +3216,13 @@ class DiceRollerApp:
 
     def lancer_des(self):
         talent = self.talent_combo.get()
-        talent_data = self.talent_cache.get_talent(talent)
+        talent_data = self.engine.talent_cache.get_talent(talent)
         
         if not talent_data:
-            self.update_result_labels(
-                "Talent non trouvé dans le fichier.",
-                "",
-                ""
-            )
+            self.request_redraw(result=("Talent non trouvé dans le fichier.", "", ""))
             return
 
-        karma = talent_data['karma']
+        karma = talent_data.karma
         karma_dice = self.karma_combo.get() if karma else None
 
         if karma:
@@ -653,20 +3233,35 @@ class DiceRollerApp:
         else:
             add_karma = False
 
-        result, details = self.roll_dice(
-            talent_data['des'],
-            add_karma,
-            karma_dice
-        )
+        entry = self.engine.roll(talent, karma_dice if add_karma else None)
 
-        self.update_result_labels(
+        self.request_redraw(result=(
             f'Résultat pour le talent "{talent}" '
-            f'(Niv. Tot. {int(talent_data["niv_tot"])}/{talent_data["des"]}):',
-            str(result),
-            f'Détails: {details}'
-        )
-        
-        self.add_to_history(talent, result, details)
+            f'(Niv. Tot. {int(talent_data.niv_tot)}/{talent_data.des}):',
+            str(entry['result']),
+            f'Détails: {entry["details"]}'
+        ), odds=True)
+        self.add_to_history(entry)
+
+    def update_odds(self):
+        talent = self.talent_combo.get()
+        try:
+            target = int(self.target_var.get())
+        except ValueError:
+            self.odds_label.config(text="")
+            return
+
+        probability = self.engine.success_probability(talent, target)
+        if probability is None:
+            self.odds_label.config(text="")
+            return
+
+        text = f"Réussite : {probability:.1%}"
+        if self.engine.talent_cache.get_talent(talent).karma:
+            karma_dice = self.karma_combo.get()
+            karma_probability = self.engine.success_probability(talent, target, karma_dice)
+            text += f" (avec karma {karma_dice} : {karma_probability:.1%})"
+        self.odds_label.config(text=text)
 
     def update_result_labels(self, result_text: str, value_text: str, details_text: str):
         self.result_label.config(text=result_text)
@@ -674,63 +3269,235 @@ class DiceRollerApp:
         self.details_label.config(text=details_text)
 
     def roll_dice(self, des: str, add_karma: bool = False, karma_dice: Optional[str] = None) -> Tuple[int, str]:
-        def roll_single_die(faces: int) -> Tuple[int, List[str]]:
-            total = 0
-            rolls = []
-            current_roll = random.randint(1, faces)
-            total += current_roll
-            rolls.append(f"{current_roll} (D{faces})")
-            
-            while current_roll == faces:  # Explosion
-                current_roll = random.randint(1, faces)
-                total += current_roll
-                rolls.append(f"EXP {current_roll} (D{faces})")
-                
-            return total, rolls
-
-        total_result = 0
-        all_rolls = []
-        
-        # Traiter les dés standards
-        for match in re.finditer(r"(\d*)D(\d+)", des):
-            count = int(match.group(1)) if match.group(1) else 1
-            faces = int(match.group(2))
-            
-            for _ in range(count):
-                result, rolls = roll_single_die(faces)
-                total_result += result
-                all_rolls.extend(rolls)
-        
-        # Traiter le bonus numérique
-        bonus_match = re.search(r'\+\s*(\d+)$', des)
-        if bonus_match:
-            bonus = int(bonus_match.group(1))
-            total_result += bonus
-            all_rolls.append(str(bonus))
-        
-        # Traiter le dé de karma
-        if add_karma and karma_dice:
-            karma_faces = int(karma_dice[1:])
-            karma_result, karma_rolls = roll_single_die(karma_faces)
-            total_result += karma_result
-            all_rolls.extend([f"+karma: {roll}" for roll in karma_rolls])
-        
-        return total_result, " + ".join(all_rolls)
+        return self.roll_expression(compile_dice_expression(des), add_karma, karma_dice)
+
+    def roll_many(
+        self,
+        des: str,
+        n: int,
+        karma_die: Optional[str] = None,
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        karma_faces = int(karma_die[1:]) if karma_die else None
+        return compile_dice_expression(des).roll_many(
+            n, karma_faces, np.random.default_rng(seed)
+        )
+
+    def roll_expression(
+        self,
+        expression: DiceExpression,
+        add_karma: bool = False,
+        karma_dice: Optional[str] = None
+    ) -> Tuple[int, str]:
+        karma_faces = int(karma_dice[1:]) if add_karma and karma_dice else None
+        return expression.roll(karma_faces, self.engine.dice)
 
     def on_return(self, event):
         self.lancer_des()
 
     def save_config(self):
-        self.config.save()
+        self.engine.config.save()
         messagebox.showinfo("Succès", "Configuration sauvegardée avec succès!")
 
     def reload_config(self):
-        self.config = Config()
+        self.engine.set_config(Config())
+        self.history_view.refresh()
         messagebox.showinfo("Succès", "Configuration rechargée avec succès!")
 
     def run(self):
         self.root.mainloop()
+        self.engine.roll_log.close()
+
+def read_talent_names(source: str) -> Iterator[str]:
+    if source == '-':
+        lines = sys.stdin
+    else:
+        lines = open(source, 'r', encoding='utf-8')
+    with lines:
+        for line in lines:
+            talent = line.strip()
+            if talent and not talent.startswith('#'):
+                yield talent
+
+def karma_die(value: str) -> str:
+    # Type argparse de --karma : "d6" est accepté et devient "D6"
+    die = value.strip().upper()
+    if not KARMA_DIE_PATTERN.fullmatch(die):
+        raise argparse.ArgumentTypeError(f"dé de karma invalide : {value!r} (ex. D6)")
+    return die
+
+def run_headless(args: argparse.Namespace) -> int:
+    # Pas de journal par défaut : les jets de préparation faussent les statistiques de campagne
+    config = Config()
+    engine = RollEngine(config, roll_log=RollLog.for_config(config) if args.log else None)
+    file_path = args.file or engine.sheet_cache.last_file
+    if not file_path:
+        print("Aucune fiche : préciser --file", file=sys.stderr)
+        return 2
+
+    # stdout est réservé aux lignes JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        engine.load_file(file_path)
+
+    if args.seed is not None or args.rng:
+        engine.dice = make_dice(args.rng or config.data['rng_backend'], args.seed)
+    karma_dice = args.karma or None
+    for talent in read_talent_names(args.talents):
+        for _ in range(args.count):
+            entry = engine.roll(talent, karma_dice)
+            if entry is None:
+                entry = {'talent': talent, 'error': "Talent non trouvé dans le fichier."}
+            print(json.dumps(entry, ensure_ascii=False), flush=args.talents == '-')
+    if engine.roll_log is not None:
+        engine.roll_log.close()
+    return 0
+
+def run_simulation(args: argparse.Namespace) -> int:
+    engine = RollEngine()
+    file_path = args.file or engine.sheet_cache.last_file
+    if not file_path:
+        print("Aucune fiche : préciser --file", file=sys.stderr)
+        return 2
+    with contextlib.redirect_stdout(sys.stderr):
+        engine.load_file(file_path)
+
+    low, _, high = args.targets.partition('-')
+    result = simulate_talents(
+        engine.talent_cache,
+        list(range(int(low), int(high or low) + 1)),
+        args.karma or engine.config.data['default_karma_die'],
+        args.rolls,
+        args.seed,
+        args.workers
+    )
+    if args.csv:
+        result.to_csv(args.csv)
+    else:
+        result.write_csv(sys.stdout)
+    print(f"graine {result.seed}", file=sys.stderr)
+    return 0
+
+def run_convert(args: argparse.Namespace) -> int:
+    config = Config()
+    file_paths = []
+    for path in args.convert:
+        file_paths.extend(workbook_files(path) if os.path.isdir(path) else [path])
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        written, errors = convert_workbooks(
+            file_paths, config.data, config.config_talents, args.output, args.workers
+        )
+    for file_path in written:
+        print(file_path)
+    for file_path, error in errors.items():
+        print(f"Erreur lors de la conversion de {file_path} : {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+def print_log_statistics(args: argparse.Namespace) -> int:
+    from datetime import datetime
+
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    until = datetime.fromisoformat(args.until).timestamp() if args.until else None
+    base_filename = RollLog.for_config(Config()).base_filename
+    statistics = roll_log_statistics(base_filename, since, until)
+    for talent, stats in sorted(statistics.items(), key=lambda item: -item[1]['rolls']):
+        print(json.dumps({'talent': talent, **stats}, ensure_ascii=False))
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Lanceur de dés Earthdawn")
+    parser.add_argument(
+        '--startup-benchmark',
+        action='store_true',
+        help="affiche le temps jusqu'à la première itération de la boucle Tk puis quitte"
+    )
+    headless = parser.add_argument_group("mode sans interface")
+    headless.add_argument(
+        '--headless',
+        action='store_true',
+        help="lance les talents lus sur l'entrée standard (un par ligne) et écrit les résultats en JSON"
+    )
+    headless.add_argument('--file', help="fiche Excel (par défaut la dernière ouverte)")
+    headless.add_argument('--talents', default='-', help="fichier de talents, '-' pour l'entrée standard")
+    headless.add_argument('--karma', metavar='DE', type=karma_die, help="dé de karma pour les talents à karma, ex. D6")
+    headless.add_argument('--count', type=int, default=1, help="nombre de lancers par talent")
+    headless.add_argument('--seed', type=int, help="graine du générateur aléatoire")
+    headless.add_argument('--rng', choices=sorted(DICE_BACKENDS), help="générateur des dés (par défaut celui de la configuration)")
+    headless.add_argument('--log', action='store_true', help="enregistre aussi ces lancers dans le journal")
+    simulation = parser.add_argument_group("simulation")
+    simulation.add_argument(
+        '--simulate',
+        action='store_true',
+        help="matrice talent x seuil de difficulté en CSV (avec --file, --karma, --seed)"
+    )
+    simulation.add_argument('--targets', default=f"{SIMULATION_TARGETS[0]}-{SIMULATION_TARGETS[1]}", help="seuils, ex. 5-20")
+    simulation.add_argument('--rolls', type=int, default=SIMULATION_ROLLS, help="lancers par talent")
+    simulation.add_argument('--workers', type=int, help="nombre de processus")
+    simulation.add_argument('--csv', help="fichier CSV de sortie (par défaut la sortie standard)")
+    log = parser.add_argument_group("journal des lancers")
+    log.add_argument('--log-stats', action='store_true', help="statistiques par talent sur tout le journal")
+    log.add_argument('--since', metavar='DATE', help="date ISO de début, ex. 2024-01-31")
+    log.add_argument('--until', metavar='DATE', help="date ISO de fin (exclue)")
+    convert = parser.add_argument_group("format natif")
+    convert.add_argument(
+        '--convert',
+        nargs='+',
+        metavar='FICHE',
+        help=f"convertit des fiches Excel ou des dossiers de fiches en fichiers {NATIVE_SHEET_EXTENSION}"
+    )
+    convert.add_argument('--output', metavar='DOSSIER', help="dossier des fichiers convertis (par défaut à côté des fiches)")
+    server = parser.add_argument_group("serveur de table")
+    server.add_argument(
+        '--serve',
+        nargs='*',
+        metavar='FICHE',
+        help="démarre un serveur local partagé par la table avec ces fiches"
+    )
+    server.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument(
+        '--profile',
+        metavar='JSON',
+        help="suit la mémoire et écrit en quittant les latences par étape (p50/p95/p99) dans ce fichier"
+    )
+    parser.add_argument(
+        '--log-level',
+        choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'),
+        help="niveau des diagnostics sur stderr (par défaut celui de la configuration)"
+    )
+    args = parser.parse_args()
+
+    log_level = args.log_level or str(Config().data['log_level']).upper()
+    logging.basicConfig(
+        level=log_level if isinstance(logging.getLevelName(log_level), int) else LOG_LEVEL,
+        format='%(levelname)s %(message)s'
+    )
+    if args.profile:
+        tracemalloc.start()
+        atexit.register(perf.dump, args.profile)
+
+    if args.headless:
+        sys.exit(run_headless(args))
+    if args.simulate:
+        sys.exit(run_simulation(args))
+    if args.log_stats:
+        sys.exit(print_log_statistics(args))
+    if args.convert:
+        sys.exit(run_convert(args))
+    if args.serve is not None:
+        with contextlib.redirect_stdout(sys.stderr):
+            try:
+                asyncio.run(RollServer(port=args.port).serve_forever(args.serve))
+            except KeyboardInterrupt:
+                pass
+        return
 
-if __name__ == "__main__":
     app = DiceRollerApp()
-    app.run()
\ No newline at end of file
+    if args.startup_benchmark:
+        app.root.after(0, app.report_startup_time)
+    app.run()
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # roll.exe : les processus de travail relancent l'exécutable
+    main()
\ No newline at end of file